@@ -7,13 +7,32 @@ Provides detection of:
 - Application layers (routes, controllers, services, models)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
+import os
 import re
 
 
+# Source extensions read for analysis; files are grouped in this order
+SOURCE_EXTENSIONS = (".py", ".js", ".ts", ".go", ".rs", ".cpp", ".h", ".hpp", ".cc", ".cxx", ".c")
+
+# Directories never descended into (VCS data, environments, dependencies, caches)
+SKIP_DIRS = frozenset({".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__", ".pui"})
+
+
+def _io_threads() -> int:
+    """Number of threads reading source files (PUI_IO_THREADS overrides)."""
+    try:
+        return max(1, int(os.environ["PUI_IO_THREADS"]))
+    except (KeyError, ValueError):
+        return min(32, (os.cpu_count() or 1) * 4)
+
+
 class FrameworkType(Enum):
     """Types of frameworks that can be detected."""
     WEB = "web"
@@ -158,35 +177,60 @@ class FrameworkDetector:
     
     def detect_frameworks(self, files_content: Dict[str, str], languages: List[str]) -> List[Framework]:
         """Detect frameworks from file contents."""
-        frameworks = []
+        matches = self.start_matches(languages)
+        for file_path, content in files_content.items():
+            self.match_file(matches, file_path, content)
+        return self.collect_frameworks(matches)
+    
+    def start_matches(self, languages: List[str]) -> Dict[int, Tuple[List[str], List[str]]]:
+        """
+        Create the per-framework match state for an incremental scan.
+        
+        Args:
+            languages: Languages detected in the repository (empty for all)
         
-        for name, fw_type, import_patterns, decorator_patterns, fw_languages in self.FRAMEWORK_SIGNATURES:
+        Returns:
+            Dict of signature index to (matched files, entry points) for
+            every framework applicable to the languages
+        """
+        matches = {}
+        for i, signature in enumerate(self.FRAMEWORK_SIGNATURES):
+            fw_languages = signature[4]
             # Skip if framework is not for detected languages
             if languages and not any(lang in languages for lang in fw_languages):
                 continue
-                
-            matched_files = []
-            entry_points = []
+            matches[i] = ([], [])
+        return matches
+    
+    def match_file(self, matches: Dict[int, Tuple[List[str], List[str]]], file_path: str, content: str) -> None:
+        """Record which frameworks a single file uses."""
+        for i, (matched_files, entry_points) in matches.items():
+            _, _, import_patterns, decorator_patterns, _ = self.FRAMEWORK_SIGNATURES[i]
             
-            for file_path, content in files_content.items():
-                # Check imports
-                import_match = any(re.search(pattern, content) for pattern in import_patterns)
-                
-                # Check decorators/usage
-                decorator_match = any(re.search(pattern, content) for pattern in decorator_patterns)
-                
-                if import_match or decorator_match:
-                    matched_files.append(file_path)
-                    
-                    # Try to find entry points
-                    if decorator_match:
-                        for pattern in decorator_patterns:
-                            for match in re.finditer(pattern, content):
-                                # Extract some context
-                                start = max(0, match.start() - 50)
-                                end = min(len(content), match.end() + 50)
-                                entry_points.append(content[start:end].strip()[:50])
+            # Check imports
+            import_match = any(re.search(pattern, content) for pattern in import_patterns)
             
+            # Check decorators/usage
+            decorator_match = any(re.search(pattern, content) for pattern in decorator_patterns)
+            
+            if import_match or decorator_match:
+                matched_files.append(file_path)
+                
+                # Try to find entry points
+                if decorator_match:
+                    for pattern in decorator_patterns:
+                        for match in re.finditer(pattern, content):
+                            # Extract some context
+                            start = max(0, match.start() - 50)
+                            end = min(len(content), match.end() + 50)
+                            entry_points.append(content[start:end].strip()[:50])
+    
+    def collect_frameworks(self, matches: Dict[int, Tuple[List[str], List[str]]]) -> List[Framework]:
+        """Build the detected frameworks from an incremental scan."""
+        frameworks = []
+        
+        for i, (matched_files, entry_points) in matches.items():
+            name, fw_type = self.FRAMEWORK_SIGNATURES[i][:2]
             if matched_files:
                 # Calculate confidence based on number of files and patterns
                 confidence = min(1.0, (len(matched_files) * 0.2) + (0.3 if entry_points else 0))
@@ -223,31 +267,36 @@ class LayerClassifier:
     
     def classify_layers(self, files_content: Dict[str, str]) -> List[Layer]:
         """Classify files into layers."""
-        layers = {layer_type: Layer(type=layer_type) for layer_type in LayerType}
-        
+        layers = self.start_layers()
         for file_path, content in files_content.items():
-            classified = False
+            self.classify_file(layers, file_path, content)
+        return self.collect_layers(layers)
+    
+    def start_layers(self) -> Dict[LayerType, Layer]:
+        """Create the empty layers for an incremental classification."""
+        return {layer_type: Layer(type=layer_type) for layer_type in LayerType}
+    
+    def classify_file(self, layers: Dict[LayerType, Layer], file_path: str, content: str) -> None:
+        """Add a single file to the layer it belongs to, if any."""
+        for layer_type, path_patterns, content_patterns in self.LAYER_PATTERNS:
+            # Check path patterns
+            path_match = any(re.search(pattern, file_path) for pattern in path_patterns)
             
-            for layer_type, path_patterns, content_patterns in self.LAYER_PATTERNS:
-                # Check path patterns
-                path_match = any(re.search(pattern, file_path) for pattern in path_patterns)
-                
-                # Check content patterns
-                content_match = any(re.search(pattern, content) for pattern in content_patterns)
-                
-                if path_match or content_match:
-                    layers[layer_type].files.append(file_path)
-                    classified = True
-                    break
+            # Check content patterns
+            content_match = any(re.search(pattern, content) for pattern in content_patterns)
             
-            # If not classified, try to infer from imports and structure
-            if not classified:
-                if self._looks_like_model(content):
-                    layers[LayerType.MODELS].files.append(file_path)
-                elif self._looks_like_service(content):
-                    layers[LayerType.SERVICES].files.append(file_path)
-        
-        # Return only layers with files
+            if path_match or content_match:
+                layers[layer_type].files.append(file_path)
+                return
+        
+        # If not classified, try to infer from imports and structure
+        if self._looks_like_model(content):
+            layers[LayerType.MODELS].files.append(file_path)
+        elif self._looks_like_service(content):
+            layers[LayerType.SERVICES].files.append(file_path)
+    
+    def collect_layers(self, layers: Dict[LayerType, Layer]) -> List[Layer]:
+        """Return only layers with files."""
         return [layer for layer in layers.values() if layer.files]
     
     def _looks_like_model(self, content: str) -> bool:
@@ -283,6 +332,30 @@ class PatternDetector:
     
     def detect_patterns(self, layers: List[Layer], files_content: Dict[str, str]) -> List[str]:
         """Detect architectural patterns."""
+        found: Set[str] = set()
+        for content in files_content.values():
+            self.match_content(found, content)
+        return self.collect_patterns(layers, found)
+    
+    def match_content(self, found: Set[str], content: str) -> None:
+        """Add the content-based patterns a single file shows to found."""
+        for pattern_name, required in self.PATTERNS:
+            if isinstance(required[0], LayerType) or pattern_name in found:
+                continue
+            if all(re.search(p, content) for p in required):
+                found.add(pattern_name)
+    
+    def collect_patterns(self, layers: List[Layer], found: Set[str]) -> List[str]:
+        """
+        List detected patterns in PATTERNS order.
+        
+        Args:
+            layers: Classified layers, for the layer-based patterns
+            found: Content-based patterns seen in at least one file
+        
+        Returns:
+            Names of the detected patterns
+        """
         detected = []
         
         # Check layer-based patterns
@@ -293,15 +366,9 @@ class PatternDetector:
                 # Layer-based pattern
                 if all(layer in layer_types for layer in required_layers):
                     detected.append(pattern_name)
-            else:
+            elif pattern_name in found:
                 # Content-based pattern
-                pattern_found = False
-                for content in files_content.values():
-                    if all(re.search(p, content) for p in required_layers):
-                        pattern_found = True
-                        break
-                if pattern_found:
-                    detected.append(pattern_name)
+                detected.append(pattern_name)
         
         return detected
 
@@ -317,16 +384,41 @@ class ArchitectureAnalyzer:
     
     def analyze(self, files_content: Dict[str, str], languages: Optional[List[str]] = None) -> ArchitecturePack:
         """Perform full architecture analysis."""
+        return self.analyze_files(files_content.items(), languages)
+    
+    def analyze_files(self, files: Iterable[Tuple[str, str]], languages: Optional[List[str]] = None) -> ArchitecturePack:
+        """
+        Perform full architecture analysis in a single pass over files.
+        
+        Each file's content is only needed while it is being matched, so
+        files can be streamed from disk instead of held in memory.
+        
+        Args:
+            files: (relative path, content) pairs
+            languages: Languages detected in the repository
+        
+        Returns:
+            Architecture analysis pack
+        """
         pack = ArchitecturePack()
         
-        # Detect frameworks
-        pack.frameworks = self.framework_detector.detect_frameworks(files_content, languages or [])
+        frameworks = self.framework_detector.start_matches(languages or [])
+        layers = self.layer_classifier.start_layers()
+        patterns: Set[str] = set()
         
-        # Classify layers
-        pack.layers = self.layer_classifier.classify_layers(files_content)
+        for file_path, content in files:
+            # Detect frameworks
+            self.framework_detector.match_file(frameworks, file_path, content)
+            
+            # Classify layers
+            self.layer_classifier.classify_file(layers, file_path, content)
+            
+            # Detect content-based patterns
+            self.pattern_detector.match_content(patterns, content)
         
-        # Detect patterns
-        pack.patterns = self.pattern_detector.detect_patterns(pack.layers, files_content)
+        pack.frameworks = self.framework_detector.collect_frameworks(frameworks)
+        pack.layers = self.layer_classifier.collect_layers(layers)
+        pack.patterns = self.pattern_detector.collect_patterns(pack.layers, patterns)
         
         # Generate recommendations
         pack.recommendations = self._generate_recommendations(pack)
@@ -358,19 +450,79 @@ class ArchitectureAnalyzer:
         return recommendations
 
 
+def iter_source_files(repo_root: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the repository's source files, reading each one on demand.
+    
+    The tree is walked once up front to collect paths only; contents are
+    read on a thread pool a bounded number of files ahead of the caller, so
+    memory stays independent of repository size.
+    
+    Args:
+        repo_root: Repository root directory
+    
+    Yields:
+        (relative path, content) pairs, grouped by extension in
+        SOURCE_EXTENSIONS order and in walk order within each extension.
+        Unreadable files are skipped.
+    """
+    by_ext: Dict[str, List[Tuple[str, str]]] = {ext: [] for ext in SOURCE_EXTENSIONS}
+    
+    for dirpath, dirnames, filenames in os.walk(repo_root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        rel_dir = os.path.relpath(dirpath, repo_root)
+        
+        for name in filenames:
+            bucket = by_ext.get(os.path.splitext(name)[1])
+            if bucket is not None:
+                rel_path = name if rel_dir == "." else os.path.join(rel_dir, name)
+                bucket.append((rel_path, os.path.join(dirpath, name)))
+    
+    paths = [item for bucket in by_ext.values() for item in bucket]
+    workers = min(_io_threads(), len(paths))
+    
+    if workers < 2:
+        for item in paths:
+            result = _read_source(item)
+            if result is not None:
+                yield result
+        return
+    
+    # Reads release the GIL, so keep a bounded window of reads in flight
+    # ahead of the consumer; results are still yielded in path order
+    pending_paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        window = deque(executor.submit(_read_source, item) for item in islice(pending_paths, workers * 2))
+        while window:
+            result = window.popleft().result()
+            item = next(pending_paths, None)
+            if item is not None:
+                window.append(executor.submit(_read_source, item))
+            if result is not None:
+                yield result
+
+
+def _read_source(item: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+    """
+    Read one (relative path, path) entry; None if it can't be read.
+    
+    Decodes as UTF-8 with replacement, so files with stray non-UTF-8 bytes
+    are still analyzed instead of being dropped on a decode error.
+    """
+    rel_path, path = item
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return rel_path, f.read()
+    except OSError:
+        return None
+
+
 def analyze_architecture(repo_root: Path, files_content: Optional[Dict[str, str]] = None, languages: Optional[List[str]] = None) -> ArchitecturePack:
     """Convenience function to analyze repository architecture."""
     analyzer = ArchitectureAnalyzer(repo_root)
     
     if files_content is None:
-        # Load files from repo
-        files_content = {}
-        for ext in ["*.py", "*.js", "*.ts", "*.go", "*.rs", "*.cpp", "*.h", "*.hpp", "*.cc", "*.cxx", "*.c"]:
-            for file_path in repo_root.rglob(ext):
-                try:
-                    rel_path = str(file_path.relative_to(repo_root))
-                    files_content[rel_path] = file_path.read_text()
-                except Exception:
-                    pass
+        # Stream files from the repo
+        return analyzer.analyze_files(iter_source_files(repo_root), languages)
     
     return analyzer.analyze(files_content, languages)
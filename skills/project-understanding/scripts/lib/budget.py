@@ -8,7 +8,8 @@ Provides utilities for:
 """
 
 import os
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
 
@@ -46,6 +47,16 @@ MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
     "haiku": 200000,
 }
 
+# Environment variables read by detect_model_context()
+MODEL_ENV_VARS = (
+    "PUI_MODEL",
+    "OPENAI_MODEL",
+    "ANTHROPIC_MODEL",
+    "AIDER_MODEL",
+    "CURSOR_MODEL",
+    "PUI_CONTEXT_WINDOW",
+)
+
 
 def detect_model_context() -> ModelContext:
     """
@@ -171,6 +182,20 @@ def resolve_budget(
     Returns:
         Resolved token budget
     """
+    # Results are memoized; "auto" is keyed on the model environment so
+    # changes to it are still picked up
+    env = tuple(os.getenv(name) for name in MODEL_ENV_VARS) if budget_arg == "auto" else None
+    return _resolve_budget(budget_arg, pack_type, config_budget, env)
+
+
+@lru_cache(maxsize=32)
+def _resolve_budget(
+    budget_arg: str,
+    pack_type: str,
+    config_budget: Optional[int],
+    env: Optional[Tuple[Optional[str], ...]]
+) -> int:
+    """Resolve a budget; env is the model environment and only keys the cache."""
     if budget_arg == "auto":
         context = detect_model_context()
         return calculate_auto_budget(context, pack_type)
@@ -9,15 +9,23 @@ Provides SQLite database management with:
 """
 
 import sqlite3
+import fnmatch
 import hashlib
 import json
+import re
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 
 SCHEMA_VERSION = 2
 
+# Maximum IDs bound into one "IN (...)" list (below SQLite's 999 variable limit)
+MAX_IN_PARAMS = 500
+
+# Memory map for read-only connections (256 MB)
+READONLY_MMAP_SIZE = 256 * 1024 * 1024
+
 # Schema definition
 CREATE_TABLES_SQL = """
 -- Files table: stores metadata about indexed source files
@@ -118,6 +126,72 @@ CREATE TRIGGER IF NOT EXISTS symbols_au AFTER UPDATE ON symbols BEGIN
 END;
 """
 
+# Trigram index over symbol names, so substring searches (name LIKE '%x%')
+# use an index instead of scanning symbols. Needs SQLite 3.34+.
+CREATE_TRIGRAM_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols_trigram USING fts5(
+    name,
+    content='symbols',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS symbols_trigram_ai AFTER INSERT ON symbols BEGIN
+    INSERT INTO symbols_trigram(rowid, name) VALUES (new.id, new.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_trigram_ad AFTER DELETE ON symbols BEGIN
+    INSERT INTO symbols_trigram(symbols_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_trigram_au AFTER UPDATE ON symbols BEGIN
+    INSERT INTO symbols_trigram(symbols_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO symbols_trigram(rowid, name) VALUES (new.id, new.name);
+END;
+"""
+
+# Row counts of the main tables, kept exact by triggers so summaries don't
+# need a COUNT(*) scan. Seeded from the tables when first created.
+CREATE_COUNTS_SQL = """
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS meta_counts (
+    name TEXT PRIMARY KEY,
+    cnt INTEGER NOT NULL
+);
+
+INSERT OR REPLACE INTO meta_counts (name, cnt)
+    SELECT 'files', COUNT(*) FROM files
+    UNION ALL SELECT 'symbols', COUNT(*) FROM symbols
+    UNION ALL SELECT 'edges', COUNT(*) FROM edges;
+
+CREATE TRIGGER IF NOT EXISTS files_count_ai AFTER INSERT ON files BEGIN
+    UPDATE meta_counts SET cnt = cnt + 1 WHERE name = 'files';
+END;
+
+CREATE TRIGGER IF NOT EXISTS files_count_ad AFTER DELETE ON files BEGIN
+    UPDATE meta_counts SET cnt = cnt - 1 WHERE name = 'files';
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_count_ai AFTER INSERT ON symbols BEGIN
+    UPDATE meta_counts SET cnt = cnt + 1 WHERE name = 'symbols';
+END;
+
+CREATE TRIGGER IF NOT EXISTS symbols_count_ad AFTER DELETE ON symbols BEGIN
+    UPDATE meta_counts SET cnt = cnt - 1 WHERE name = 'symbols';
+END;
+
+CREATE TRIGGER IF NOT EXISTS edges_count_ai AFTER INSERT ON edges BEGIN
+    UPDATE meta_counts SET cnt = cnt + 1 WHERE name = 'edges';
+END;
+
+CREATE TRIGGER IF NOT EXISTS edges_count_ad AFTER DELETE ON edges BEGIN
+    UPDATE meta_counts SET cnt = cnt - 1 WHERE name = 'edges';
+END;
+
+COMMIT;
+"""
+
 
 class DatabaseError(Exception):
     """Database operation error."""
@@ -145,14 +219,28 @@ class Database:
         self._conn: Optional[sqlite3.Connection] = None
         self._transaction_count = 0
         self._batch_size = 100
+        self._has_trigram = False
         
     def _log(self, message: str) -> None:
         """Log message if verbose mode enabled."""
         if self.verbose:
             print(f"[DB] {message}")
     
-    def connect(self) -> "Database":
-        """Connect to database and initialize schema if needed."""
+    def connect(self, readonly: bool = False) -> "Database":
+        """
+        Connect to database and initialize schema if needed.
+        
+        Args:
+            readonly: Open an existing database for queries only, using its
+                schema as found. Read-only connections skip schema setup and
+                never take write locks, so concurrent readers don't contend.
+        
+        Returns:
+            self
+        """
+        if readonly:
+            return self._connect_readonly()
+        
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         self._conn = sqlite3.connect(str(self.db_path))
@@ -164,6 +252,20 @@ class Database:
         self._init_schema()
         return self
     
+    def _connect_readonly(self) -> "Database":
+        """Open the existing database read-only."""
+        # Not immutable=1: that would ignore the WAL, hiding rows written
+        # since the last checkpoint
+        self._conn = sqlite3.connect(f"{self.db_path.absolute().as_uri()}?mode=ro", uri=True)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA query_only = 1")
+        self._conn.execute(f"PRAGMA mmap_size = {READONLY_MMAP_SIZE}")
+        
+        self._has_trigram = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'symbols_trigram'"
+        ).fetchone() is not None
+        return self
+    
     def close(self) -> None:
         """Close database connection."""
         if self._conn:
@@ -196,7 +298,9 @@ class Database:
         self.conn.executescript(CREATE_TABLES_SQL)
         
         # Create FTS tables
-        self.conn.executescript(CREATE_FTS_SQL)
+        self._init_fts_index()
+        self._init_trigram_index()
+        self._init_row_counts()
         
         # Check/update schema version
         current_version = self._get_schema_version()
@@ -209,6 +313,49 @@ class Database:
         
         self.conn.commit()
     
+    def _init_fts_index(self) -> None:
+        """Create the FTS symbol index, filling it from existing symbols."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'symbols_fts'"
+        ).fetchone()
+        self.conn.executescript(CREATE_FTS_SQL)
+        if not exists:
+            # An index built without symbols_fts would otherwise search an
+            # empty table until every symbol is rewritten
+            self.conn.execute("INSERT INTO symbols_fts(symbols_fts) VALUES ('rebuild')")
+    
+    def _init_trigram_index(self) -> None:
+        """Create the trigram symbol index, filling it from existing symbols."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'symbols_trigram'"
+        ).fetchone()
+        if exists:
+            self._has_trigram = True
+            return
+        
+        try:
+            self.conn.executescript(CREATE_TRIGRAM_SQL)
+        except sqlite3.OperationalError as e:
+            # Older SQLite without the trigram tokenizer; searches fall back to LIKE
+            self._log(f"Trigram index unavailable: {e}")
+            return
+        
+        self.conn.execute("INSERT INTO symbols_trigram(symbols_trigram) VALUES ('rebuild')")
+        self._has_trigram = True
+    
+    def _init_row_counts(self) -> None:
+        """Create the maintained row counts, seeding them from existing rows."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'meta_counts'"
+        ).fetchone()
+        if not exists:
+            self.conn.executescript(CREATE_COUNTS_SQL)
+    
+    def get_row_counts(self) -> Dict[str, int]:
+        """Get the maintained row counts of the files, symbols and edges tables."""
+        cursor = self.conn.execute("SELECT name, cnt FROM meta_counts")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
     def _get_schema_version(self) -> int:
         """Get current schema version from database."""
         try:
@@ -386,6 +533,14 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
     
+    def resolve_symbol_id(self, name: str) -> Optional[int]:
+        """Get the ID of a symbol by exact name (via idx_symbols_name), or None."""
+        row = self.conn.execute(
+            "SELECT id FROM symbols WHERE name = ? LIMIT 1",
+            (name,)
+        ).fetchone()
+        return row[0] if row else None
+    
     def delete_symbols_in_file(self, file_id: int) -> int:
         """Delete all symbols in a file. Returns count deleted."""
         cursor = self.conn.execute(
@@ -400,6 +555,9 @@ class Database:
         """
         Search symbols using FTS.
         
+        Glob wildcards FTS cannot express (``?``, or ``*`` anywhere but at
+        the end) are matched by :meth:`_search_symbols_glob` instead.
+        
         Args:
             query: Search query (supports FTS syntax)
             limit: Maximum results
@@ -407,6 +565,9 @@ class Database:
         Returns:
             List of matching symbols with rank
         """
+        if '?' in query or '*' in query.rstrip('*'):
+            return self._search_symbols_glob(query, limit)
+        
         cursor = self.conn.execute(
             """
             SELECT s.*, rank
@@ -420,6 +581,44 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
     
+    def _search_symbols_glob(self, pattern: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Search symbol names with a case-insensitive glob pattern.
+        
+        The glob is translated once into a LIKE pattern, which narrows the
+        candidates (through the trigram index when available), and a compiled
+        regex that confirms each surviving name.
+        
+        Args:
+            pattern: Glob pattern using ``*`` and ``?``
+            limit: Maximum results
+        
+        Returns:
+            List of matching symbols (rank is None)
+        """
+        like = pattern.replace('*', '%').replace('?', '_')
+        regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        
+        # The trigram tokenizer folds case beyond ASCII, so non-ASCII
+        # patterns scan symbols directly
+        if self._has_trigram and pattern.isascii():
+            sql = """
+                SELECT s.*, NULL AS rank
+                FROM symbols_trigram t
+                JOIN symbols s ON s.id = t.rowid
+                WHERE t.name LIKE ?
+                """
+        else:
+            sql = "SELECT s.*, NULL AS rank FROM symbols s WHERE s.name LIKE ?"
+        
+        results = []
+        for row in self.conn.execute(sql, (like,)):
+            if regex.match(row['name']):
+                results.append(dict(row))
+                if len(results) >= limit:
+                    break
+        return results
+    
     # Edge operations
     
     def add_edge(self, source_id: int, target_id: int, kind: str, file_id: int,
@@ -515,6 +714,78 @@ class Database:
         )
         return [dict(row) for row in cursor.fetchall()]
     
+    def prefetch_subgraph(
+        self, symbol_id: int, depth: int
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, List[Dict[str, Any]]], Dict[int, List[Dict[str, Any]]]]:
+        """
+        Load the callers and callees of a symbol with a few queries per level.
+        
+        Follows outgoing edges downward and incoming edges upward, one level
+        at a time, so the number of queries grows with depth rather than
+        with the number of symbols reached.
+        
+        Args:
+            symbol_id: Starting symbol ID
+            depth: Number of edge hops to follow in each direction
+        
+        Returns:
+            (symbols, outgoing, incoming) keyed by symbol ID. Symbols carry
+            their file_path. Every ID reached downward has its outgoing edges,
+            and every ID reached upward its incoming edges, as returned by
+            get_outgoing_edges/get_incoming_edges.
+        """
+        outgoing: Dict[int, List[Dict[str, Any]]] = {}
+        incoming: Dict[int, List[Dict[str, Any]]] = {}
+        walks = (
+            (outgoing, "source_id", "target_id", """
+                SELECT e.*, s.name as target_name, s.kind as target_kind
+                FROM edges e
+                JOIN symbols s ON e.target_id = s.id
+                WHERE e.source_id IN ({marks})
+                ORDER BY e.id
+            """),
+            (incoming, "target_id", "source_id", """
+                SELECT e.*, s.name as source_name, s.kind as source_kind
+                FROM edges e
+                JOIN symbols s ON e.source_id = s.id
+                WHERE e.target_id IN ({marks})
+                ORDER BY e.id
+            """),
+        )
+        
+        for edges, key, next_key, query in walks:
+            frontier = [symbol_id]
+            for level in range(depth + 1):
+                for i in range(0, len(frontier), MAX_IN_PARAMS):
+                    chunk = frontier[i:i + MAX_IN_PARAMS]
+                    for id_ in chunk:
+                        edges[id_] = []
+                    sql = query.format(marks=",".join("?" * len(chunk)))
+                    for row in self.conn.execute(sql, chunk):
+                        edges[row[key]].append(dict(row))
+                
+                if level == depth:
+                    break
+                next_ids = {edge[next_key] for id_ in frontier for edge in edges[id_]}
+                frontier = sorted(next_ids.difference(edges))
+        
+        symbols: Dict[int, Dict[str, Any]] = {}
+        ids = sorted(outgoing.keys() | incoming.keys())
+        for i in range(0, len(ids), MAX_IN_PARAMS):
+            chunk = ids[i:i + MAX_IN_PARAMS]
+            for row in self.conn.execute(
+                f"""
+                SELECT s.*, f.path as file_path
+                FROM symbols s
+                JOIN files f ON s.file_id = f.id
+                WHERE s.id IN ({",".join("?" * len(chunk))})
+                """,
+                chunk
+            ):
+                symbols[row['id']] = dict(row)
+        
+        return symbols, outgoing, incoming
+    
     def delete_edges_in_file(self, file_id: int) -> int:
         """Delete all edges associated with a file."""
         cursor = self.conn.execute(
@@ -549,14 +820,7 @@ class Database:
         stats = {}
         
         # Table counts
-        cursor = self.conn.execute("SELECT COUNT(*) FROM files")
-        stats['files'] = cursor.fetchone()[0]
-        
-        cursor = self.conn.execute("SELECT COUNT(*) FROM symbols")
-        stats['symbols'] = cursor.fetchone()[0]
-        
-        cursor = self.conn.execute("SELECT COUNT(*) FROM edges")
-        stats['edges'] = cursor.fetchone()[0]
+        stats.update(self.get_row_counts())
         
         cursor = self.conn.execute("SELECT COUNT(*) FROM callsites")
         stats['callsites'] = cursor.fetchone()[0]
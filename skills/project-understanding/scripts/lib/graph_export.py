@@ -69,6 +69,10 @@ class GraphExporter:
         if not self.db:
             return
         
+        # Everything the traversal can reach, loaded up front instead of
+        # querying symbol and edges per visited node
+        symbols, outgoing, incoming = self.db.prefetch_subgraph(symbol_id, depth)
+        
         visited: Set[int] = set()
         
         def traverse(current_id: int, current_depth: int, direction: str) -> None:
@@ -78,20 +82,10 @@ class GraphExporter:
             visited.add(current_id)
             
             # Get symbol info
-            cursor = self.db._conn.execute(
-                """
-                SELECT s.*, f.path as file_path
-                FROM symbols s
-                JOIN files f ON s.file_id = f.id
-                WHERE s.id = ?
-                """,
-                (current_id,)
-            )
-            row = cursor.fetchone()
-            if not row:
+            symbol = symbols.get(current_id)
+            if not symbol:
                 return
             
-            symbol = dict(row)
             node_id = str(current_id)
             
             # Add node
@@ -105,7 +99,7 @@ class GraphExporter:
             
             # Traverse edges
             if direction in ('both', 'up') and include_callers:
-                edges = self.db.get_incoming_edges(current_id)
+                edges = incoming[current_id]
                 for edge in edges:
                     caller_id = edge['source_id']
                     if caller_id not in visited:
@@ -118,7 +112,7 @@ class GraphExporter:
                         traverse(caller_id, current_depth + 1, 'up')
             
             if direction in ('both', 'down') and include_callees:
-                edges = self.db.get_outgoing_edges(current_id)
+                edges = outgoing[current_id]
                 for edge in edges:
                     callee_id = edge['target_id']
                     if callee_id not in visited:
@@ -8,7 +8,7 @@ CLI-level include/exclude overrides.
 import fnmatch
 import os
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterable, List, Optional, Set
 
 
 class IgnorePattern:
@@ -166,6 +166,30 @@ class IgnoreManager:
         self._log(f"Adding exclude pattern: {pattern}")
         self.exclude_patterns.append(IgnorePattern(pattern, "cli-exclude"))
     
+    def extend_include(self, patterns: Iterable[str]) -> None:
+        """
+        Add several CLI include patterns at once.
+        
+        Args:
+            patterns: Glob patterns to include
+        """
+        added = [IgnorePattern(p, "cli-include") for p in patterns]
+        if added:
+            self._log(f"Adding {len(added)} include pattern(s)")
+            self.include_patterns.extend(added)
+    
+    def extend_exclude(self, patterns: Iterable[str]) -> None:
+        """
+        Add several CLI exclude patterns at once.
+        
+        Args:
+            patterns: Glob patterns to exclude
+        """
+        added = [IgnorePattern(p, "cli-exclude") for p in patterns]
+        if added:
+            self._log(f"Adding {len(added)} exclude pattern(s)")
+            self.exclude_patterns.extend(added)
+    
     def should_ignore(self, path: str, is_dir: bool = False) -> bool:
         """
         Check if a path should be ignored.
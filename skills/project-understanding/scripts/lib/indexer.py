@@ -5,8 +5,10 @@ Scans files, computes hashes, skips unchanged files, and updates the database.
 Provides batching, timing logs, and statistics.
 """
 
+import os
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
@@ -100,6 +102,9 @@ class FileInfo:
 class Indexer:
     """Incremental indexer for source code."""
     
+    # Maximum number of threads parsing files of different languages at once
+    MAX_PARSE_WORKERS = 8
+    
     def __init__(self, 
                  repo_root: Path,
                  skill_root: Path,
@@ -127,6 +132,10 @@ class Indexer:
         self.config: Optional[Config] = None
         self.parser: Optional[TreeSitterParser] = None
         
+        # Parse results (or parse exceptions) computed ahead by
+        # _prefetch_parses, keyed by relative path
+        self._parsed: Dict[str, Any] = {}
+        
         # Timing logs
         self.timings: Dict[str, List[float]] = defaultdict(list)
     
@@ -168,10 +177,8 @@ class Indexer:
             self.ignore_manager.load(default_ignore_path=default_ignore)
             
             # Apply CLI include/exclude from config
-            for pattern in self.config.ignore.include:
-                self.ignore_manager.add_include(pattern)
-            for pattern in self.config.ignore.exclude:
-                self.ignore_manager.add_exclude(pattern)
+            self.ignore_manager.extend_include(self.config.ignore.include)
+            self.ignore_manager.extend_exclude(self.config.ignore.exclude)
             
             # Initialize database
             db_path = get_db_path(self.repo_root)
@@ -419,7 +426,12 @@ class Indexer:
                 }]
             
             try:
-                result = self.parser.parse_file(file_info.path)
+                if file_info.relative_path in self._parsed:
+                    result = self._parsed.pop(file_info.relative_path)
+                    if isinstance(result, Exception):
+                        raise result
+                else:
+                    result = self.parser.parse_file(file_info.path)
                 
                 if result is None:
                     # File type not supported or parsing failed
@@ -528,6 +540,54 @@ class Indexer:
                     'calls': []
                 }]
     
+    def _prefetch_parses(self, files: List[FileInfo]) -> None:
+        """
+        Parse a batch of files ahead of indexing, one thread per language.
+        
+        Only parsing runs on the worker threads; all database writes stay on
+        the calling thread. Files are grouped by language because each
+        language has a single tree-sitter Parser, which must not be used by
+        two threads at once.
+        
+        Args:
+            files: Files about to be indexed
+        """
+        if not self.parser:
+            return
+        
+        language_support = self.parser.language_support
+        buckets: Dict[str, List[FileInfo]] = defaultdict(list)
+        for file_info in files:
+            language = language_support.get_language_for_file(file_info.path)
+            if language:
+                buckets[language].append(file_info)
+        
+        workers = min(len(buckets), self.MAX_PARSE_WORKERS, os.cpu_count() or 1)
+        if workers < 2:
+            # Nothing to overlap; parse inline while indexing
+            return
+        
+        def parse_bucket(bucket: List[FileInfo]) -> None:
+            for file_info in bucket:
+                try:
+                    result = self.parser.parse_file(file_info.path)
+                except Exception as e:
+                    result = e
+                self._parsed[file_info.relative_path] = result
+        
+        with self._time("prefetch_parses"):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(parse_bucket, buckets.values()))
+    
+    def _index_batch(self, files: List[FileInfo]) -> None:
+        """Index a batch of files, parsing them in parallel first."""
+        self._prefetch_parses(files)
+        try:
+            for file_info in files:
+                self.index_file(file_info)
+        finally:
+            self._parsed.clear()
+    
     def run(self, force: bool = False) -> IndexStats:
         """
         Run the indexer.
@@ -549,7 +609,8 @@ class Indexer:
             current_paths = [f.relative_path for f in files]
             self.remove_stale_files(current_paths)
             
-            # Process each file
+            # Process each file, indexing changed files in batches
+            pending: List[FileInfo] = []
             for file_info in files:
                 if not self.db:
                     continue
@@ -565,11 +626,17 @@ class Indexer:
                         self.stats.files_new += 1
                         self._log(f"Indexing new file: {file_info.relative_path}")
                     
-                    self.index_file(file_info)
+                    pending.append(file_info)
+                    if len(pending) >= self.batch_size:
+                        self._index_batch(pending)
+                        pending = []
                 else:
                     self.stats.files_unchanged += 1
                     self._log(f"Skipping unchanged file: {file_info.relative_path}")
             
+            if pending:
+                self._index_batch(pending)
+            
             # Final commit
             if self.db:
                 self.db.commit()
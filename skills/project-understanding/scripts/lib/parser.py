@@ -6,6 +6,7 @@ Supports Python, JavaScript, TypeScript, Go, and Rust.
 """
 
 import re
+import functools
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -100,7 +101,6 @@ class LanguageSupport:
         self.queries_dir = queries_dir or Path(__file__).parent / 'queries'
         self._languages: Dict[str, Any] = {}
         self._parsers: Dict[str, Parser] = {}
-        self._queries: Dict[str, Dict[str, Any]] = {}
         
         if not TREE_SITTER_AVAILABLE:
             raise ImportError(
@@ -149,26 +149,35 @@ class LanguageSupport:
         return self._parsers[language]
     
     def _load_query(self, language: str, query_name: str) -> Optional[Any]:
-        """Load a query from .scm file."""
-        if language not in self._queries:
-            self._queries[language] = {}
-        
-        if query_name not in self._queries[language]:
-            query_path = self.queries_dir / f"{language}.scm"
-            if not query_path.exists():
-                return None
-            
-            try:
-                query_text = query_path.read_text()
-                lang = self._load_language(language)
-                if not TREE_SITTER_AVAILABLE:
-                    return None
-                self._queries[language][query_name] = Query(lang, query_text)
-            except Exception:
-                # Log error but don't crash - some queries may not be available
-                return None
+        """
+        Load a query from .scm file.
         
-        return self._queries[language].get(query_name)
+        All query names for a language share the single compiled query of its
+        .scm file, which is compiled once per process (see _compile_query).
+        """
+        return _compile_query(self.queries_dir, language)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_query(queries_dir: Path, language: str) -> Optional[Any]:
+    """
+    Read and compile the .scm query file for a language.
+    
+    Cached per (queries_dir, language) so every parser instance in the
+    process shares one compiled Query instead of recompiling it.
+    """
+    query_path = queries_dir / f"{language}.scm"
+    if not query_path.exists():
+        return None
+    
+    try:
+        query_text = query_path.read_text()
+        if not TREE_SITTER_AVAILABLE or not HAS_LANGUAGE_BINDINGS:
+            return None
+        return Query(get_language(language), query_text)
+    except Exception:
+        # Log error but don't crash - some queries may not be available
+        return None
 
 
 class TreeSitterParser:
@@ -470,13 +479,15 @@ class TreeSitterParser:
                     doc_text = doc_node.text.decode('utf8') if isinstance(doc_node.text, bytes) else str(doc_node.text)
                     docstring = doc_text.strip('"\'\n ')
                 
+                start_row, start_col = node.start_point
+                end_row, end_col = node.end_point
                 symbol = Symbol(
                     name=name,
                     kind=kind,
-                    line_start=node.start_point[0] + 1,  # 1-indexed
-                    line_end=node.end_point[0] + 1,
-                    column_start=node.start_point[1],
-                    column_end=node.end_point[1],
+                    line_start=start_row + 1,  # 1-indexed
+                    line_end=end_row + 1,
+                    column_start=start_col,
+                    column_end=end_col,
                     signature=signature,
                     docstring=docstring
                 )
@@ -506,6 +517,7 @@ class TreeSitterParser:
         }
         
         target_types = definition_types.get(language, [])
+        lines = content.split('\n')
         
         def traverse(node: Node):
             if node.type in target_types:
@@ -525,21 +537,21 @@ class TreeSitterParser:
                         kind = 'method'
                     
                     # Extract signature (first line of definition)
-                    start_line = node.start_point[0]
-                    lines = content.split('\n')
+                    start_row, start_col = node.start_point
+                    end_row, end_col = node.end_point
                     signature = None
-                    if start_line < len(lines):
-                        line = lines[start_line]
+                    if start_row < len(lines):
+                        line = lines[start_row]
                         # Extract up to 200 chars for signature
                         signature = line[:200].strip()
                     
                     symbol = Symbol(
                         name=name,
                         kind=kind,
-                        line_start=node.start_point[0] + 1,
-                        line_end=node.end_point[0] + 1,
-                        column_start=node.start_point[1],
-                        column_end=node.end_point[1],
+                        line_start=start_row + 1,
+                        line_end=end_row + 1,
+                        column_start=start_col,
+                        column_end=end_col,
                         signature=signature
                     )
                     symbols.append(symbol)
@@ -735,8 +747,8 @@ class TreeSitterParser:
                 capture[1]
                 
                 callee_text = node.text.decode('utf8') if isinstance(node.text, bytes) else str(node.text)
-                line = node.start_point[0] + 1
-                column = node.start_point[1]
+                start_row, column = node.start_point
+                line = start_row + 1
                 
                 # Determine containing symbol (scope)
                 scope_symbol_id = self._find_containing_symbol(line, symbols)
@@ -813,8 +825,8 @@ class TreeSitterParser:
                 
                 if callee_node:
                     callee_text = content_bytes[callee_node.start_byte:callee_node.end_byte].decode('utf8')
-                    line = node.start_point[0] + 1
-                    column = node.start_point[1]
+                    start_row, column = node.start_point
+                    line = start_row + 1
                     scope_symbol_id = self._find_containing_symbol(line, symbols)
                     confidence = self._calculate_call_confidence(callee_text, language)
                     
@@ -833,6 +845,19 @@ class TreeSitterParser:
         return callsites
 
 
+# Shared parser for the convenience function; language parsers and
+# compiled queries are reused across calls instead of rebuilt per file.
+_DEFAULT_PARSER: Optional[TreeSitterParser] = None
+
+
+def _get_default_parser() -> TreeSitterParser:
+    """Return the process-wide default TreeSitterParser, creating it lazily."""
+    global _DEFAULT_PARSER
+    if _DEFAULT_PARSER is None:
+        _DEFAULT_PARSER = TreeSitterParser()
+    return _DEFAULT_PARSER
+
+
 # Convenience function for indexer integration
 def parse_file(path: Path, content: Optional[str] = None, queries_dir: Optional[Path] = None) -> Optional[ParseResult]:
     """
@@ -848,5 +873,8 @@ def parse_file(path: Path, content: Optional[str] = None, queries_dir: Optional[
     Returns:
         ParseResult or None if parsing failed/unsupported
     """
-    parser = TreeSitterParser(queries_dir)
+    if queries_dir is None:
+        parser = _get_default_parser()
+    else:
+        parser = TreeSitterParser(queries_dir)
     return parser.parse_file(path, content)
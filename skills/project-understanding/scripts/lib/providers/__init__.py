@@ -22,7 +22,7 @@ from .base import (
     create_provider
 )
 
-from .lsp import LSPProvider, get_default_lsp_configs, LSPClient
+from .lsp import LSPProvider, get_default_lsp_configs, LSPClient, LSPReader
 from .scip import SCIPProvider, SCIPIterator
 
 __all__ = [
@@ -49,5 +49,6 @@ __all__ = [
     # Utilities
     'get_default_lsp_configs',
     'LSPClient',
+    'LSPReader',
     'SCIPIterator',
 ]
@@ -22,7 +22,7 @@ class EdgeConfidence(Enum):
     UNKNOWN = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     """Source code position."""
     line: int
@@ -32,7 +32,7 @@ class Position:
         return f"Position(line={self.line}, char={self.character})"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Range:
     """Source code range."""
     start: Position
@@ -42,7 +42,7 @@ class Range:
         return f"Range({self.start} to {self.end})"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Location:
     """Symbol location in codebase."""
     file: str
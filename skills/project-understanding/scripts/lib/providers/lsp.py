@@ -10,10 +10,15 @@ Supports multiple language servers:
 """
 
 import json
+import os
+import re
+import selectors
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import threading
 
 from .base import (
@@ -21,18 +26,256 @@ from .base import (
     CallSite, ImportInfo, EdgeConfidence
 )
 
+# orjson is an optional, much faster drop-in for the JSON-RPC wire codec
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC message to UTF-8 bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message)
+    return json.dumps(message).encode('utf-8')
+
+
+def _decode_message(content: bytes) -> Dict[str, Any]:
+    """Deserialize a JSON-RPC message from UTF-8 bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Bytes requested per read from a server's stdout
+_READ_CHUNK = 65536
+
+# Shared default for positions missing from a server response
+_ZERO_POS = Position(line=0, character=0)
+
+# Interned line-start positions; Position is frozen, so instances are shared
+_LINE_START_POS: Dict[int, Position] = {0: _ZERO_POS}
+
+
+@lru_cache(maxsize=65536)
+def _uri_to_path(uri: str) -> str:
+    """Convert a file:// URI to a file path."""
+    return uri[7:] if uri.startswith("file://") else uri
+
+
+@lru_cache(maxsize=4096)
+def _parse_symbol_id(symbol_id: str) -> Optional[Tuple[Path, int]]:
+    """Parse a 'path:name:line' symbol ID into (path, line)."""
+    parts = symbol_id.rsplit(":", 2)
+    if len(parts) < 2:
+        return None
+    
+    try:
+        return Path(parts[0]), int(parts[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+# One line with its terminator; LSP breaks lines only at \n, \r\n and \r
+# (unlike str.splitlines, which also splits at \x0c, \u2028, ...)
+_LSP_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+
+def _incremental_change(old: str, new: str) -> Dict[str, Any]:
+    """
+    Build one didChange content change that turns old text into new text.
+    
+    Unchanged leading and trailing lines are left out, so only the edited
+    line range is sent. Ranges use line starts (character 0) except at the
+    end of a document without a trailing newline, where the UTF-16 length
+    of the last line is used as LSP requires.
+    """
+    old_lines = _LSP_LINE_RE.findall(old)
+    new_lines = _LSP_LINE_RE.findall(new)
+    limit = min(len(old_lines), len(new_lines))
+    
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    
+    if suffix or not old_lines or old_lines[-1].endswith(("\n", "\r")):
+        end = {"line": len(old_lines) - suffix, "character": 0}
+    else:
+        last = old_lines[-1]
+        end = {"line": len(old_lines) - 1, "character": len(last.encode("utf-16-le")) // 2}
+    
+    return {
+        "range": {"start": {"line": prefix, "character": 0}, "end": end},
+        "text": "".join(new_lines[prefix:len(new_lines) - suffix])
+    }
+
+
+def _position(line: int, character: int) -> Position:
+    """Build a Position, sharing interned instances for line starts."""
+    if character == 0:
+        position = _LINE_START_POS.get(line)
+        if position is None:
+            position = _LINE_START_POS[line] = Position(line=line, character=0)
+        return position
+    return Position(line=line, character=character)
+
+
+def _to_position(pos: Dict[str, Any]) -> Position:
+    """Convert a possibly partial LSP position dict to a Position."""
+    if not pos:
+        return _ZERO_POS
+    return _position(pos.get("line", 0), pos.get("character", 0))
+
+
+def _location(loc: Dict[str, Any]) -> Location:
+    """
+    Convert a well-formed LSP location dict to a Location.
+    
+    Indexes fields directly; raises KeyError/TypeError on partial input so
+    callers can fall back to a tolerant conversion.
+    """
+    rng = loc["range"]
+    start = rng["start"]
+    end = rng["end"]
+    return Location(
+        file=_uri_to_path(loc["uri"]),
+        range=Range(
+            start=_position(start["line"], start["character"]),
+            end=_position(end["line"], end["character"])
+        )
+    )
+
+
+class _PendingRequest:
+    """An in-flight request awaiting its response."""
+    
+    __slots__ = ("msg_id", "event", "result", "deadline")
+    
+    def __init__(self, msg_id: int, deadline: float):
+        self.msg_id = msg_id
+        self.event = threading.Event()
+        self.result: Any = None
+        # time.monotonic() value after which the request is abandoned
+        self.deadline = deadline
+
+
+class LSPReader:
+    """
+    Single reader thread multiplexing the stdout of several LSP servers.
+    
+    Instead of one blocking reader thread per server, every registered
+    client's stdout is watched with a selector and drained as it becomes
+    readable.  Selectors do not support pipes on Windows, where clients
+    keep their own reader threads (see is_supported()).
+    """
+    
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """Check whether pipes can be multiplexed on this platform."""
+        return os.name != "nt"
+    
+    def register(self, client: "LSPClient") -> None:
+        """Start draining a started client's stdout."""
+        with self._lock:
+            self._selector.register(client.process.stdout.fileno(), selectors.EVENT_READ, client)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+    
+    def unregister(self, client: "LSPClient") -> None:
+        """Stop draining a client's stdout."""
+        with self._lock:
+            try:
+                self._selector.unregister(client.process.stdout.fileno())
+            except (KeyError, ValueError):
+                pass
+    
+    def close(self) -> None:
+        """Stop the reader thread."""
+        self._stopped = True
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._selector.close()
+    
+    def _run(self) -> None:
+        """Drain readable server pipes until closed."""
+        while not self._stopped:
+            # The timeout bounds how long close() waits for the loop to exit
+            try:
+                events = self._selector.select(timeout=0.5)
+            except (OSError, ValueError):
+                return
+            for key, _ in events:
+                try:
+                    data = os.read(key.fd, _READ_CHUNK)
+                except OSError:
+                    data = b""
+                if not data:
+                    with self._lock:
+                        try:
+                            self._selector.unregister(key.fd)
+                        except (KeyError, ValueError):
+                            pass
+                    continue
+                key.data._feed(data)
+
 
 class LSPClient:
     """JSON-RPC client for communicating with LSP servers."""
     
-    def __init__(self, command: List[str], workspace: Path, verbose: bool = False):
+    # In-flight requests live in a fixed ring indexed by msg_id & mask;
+    # must be a power of two
+    RING_SIZE = 1024
+    
+    # Seconds to wait for a response, per method
+    DEFAULT_TIMEOUT = 10.0
+    METHOD_TIMEOUTS = {
+        "textDocument/definition": 2.0,
+        "textDocument/documentSymbol": 10.0,
+        "workspace/symbol": 30.0,
+    }
+    
+    def __init__(self, command: List[str], workspace: Path, verbose: bool = False,
+                 reader: Optional["LSPReader"] = None):
+        """
+        Initialize client.
+        
+        Args:
+            command: Command line that starts the language server
+            workspace: Workspace root passed to the server
+            verbose: Enable verbose logging
+            reader: Shared reader to register with; if None the client
+                starts its own reader thread
+        """
         self.command = command
         self.workspace = workspace
         self.verbose = verbose
         self.process: Optional[subprocess.Popen] = None
         self._message_id = 0
-        self._responses: Dict[int, Any] = {}
+        self._ring: List[Optional[_PendingRequest]] = [None] * self.RING_SIZE
+        # Requests whose ring slot was still occupied when they were sent
+        self._overflow: Dict[int, _PendingRequest] = {}
+        # URI -> (mtime, version, text) of documents already sent to the server
+        self._opened: Dict[str, Tuple[float, int, str]] = {}
+        # Server's textDocumentSync kind: 1 = full text, 2 = incremental
+        self._sync_kind = 1
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stdin_fd: Optional[int] = None
+        self._read_buffer = bytearray()
+        self._content_length: Optional[int] = None
+        self._reader = reader
         self._reader_thread: Optional[threading.Thread] = None
         self._initialized = False
     
@@ -47,13 +290,20 @@ class LSPClient:
                 self.command,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                # stderr is never read; a pipe would fill up and stall a
+                # chatty server, so discard it unless debugging
+                stderr=None if self.verbose else subprocess.DEVNULL,
                 cwd=str(self.workspace)
             )
+            if hasattr(os, "writev"):
+                self._stdin_fd = self.process.stdin.fileno()
             
-            # Start reader thread
-            self._reader_thread = threading.Thread(target=self._read_responses, daemon=True)
-            self._reader_thread.start()
+            # Start reading responses
+            if self._reader is not None:
+                self._reader.register(self)
+            else:
+                self._reader_thread = threading.Thread(target=self._read_responses, daemon=True)
+                self._reader_thread.start()
             
             # Initialize handshake
             self._initialize()
@@ -76,31 +326,68 @@ class LSPClient:
                 if self.process:
                     self.process.terminate()
         
+        if self._reader is not None and self.process:
+            self._reader.unregister(self)
+        self._opened.clear()
         self._initialized = False
     
-    def _send_request(self, method: str, params: Dict[str, Any]) -> Optional[Any]:
+    def _send_request(self, method: str, params: Dict[str, Any],
+                      timeout: Optional[float] = None) -> Optional[Any]:
         """Send a JSON-RPC request and wait for response."""
+        return self._wait_response(self._send_request_async(method, params, timeout))
+    
+    def _send_request_async(self, method: str, params: Dict[str, Any],
+                            timeout: Optional[float] = None) -> _PendingRequest:
+        """
+        Send a JSON-RPC request without waiting for its response.
+        
+        Several requests can be issued back-to-back this way and then
+        collected with _wait_response, so the server works on them
+        concurrently instead of one round-trip at a time.
+        
+        Args:
+            method: JSON-RPC method name
+            params: Request parameters
+            timeout: Seconds to wait for the response (defaults to the
+                method's entry in METHOD_TIMEOUTS)
+        
+        Returns:
+            Handle to pass to _wait_response
+        """
+        if timeout is None:
+            timeout = self.METHOD_TIMEOUTS.get(method, self.DEFAULT_TIMEOUT)
+        
         with self._lock:
             self._message_id += 1
-            msg_id = self._message_id
+            request = _PendingRequest(self._message_id, time.monotonic() + timeout)
+            slot = request.msg_id & (self.RING_SIZE - 1)
+            if self._ring[slot] is None:
+                self._ring[slot] = request
+            else:
+                self._overflow[request.msg_id] = request
         
         message = {
             "jsonrpc": "2.0",
-            "id": msg_id,
+            "id": request.msg_id,
             "method": method,
             "params": params
         }
         
         self._send_message(message)
-        
-        # Wait for response with timeout
-        for _ in range(100):  # 10 second timeout
+        return request
+    
+    def _wait_response(self, request: _PendingRequest) -> Optional[Any]:
+        """Wait for the response to a request sent with _send_request_async."""
+        # Deadlines are fixed at send time, so waiting on a batch of
+        # pipelined requests is bounded by their deadlines, not their count
+        if not request.event.wait(max(0.0, request.deadline - time.monotonic())):
+            # Timed out: release the slot so a late reply is dropped
             with self._lock:
-                if msg_id in self._responses:
-                    return self._responses.pop(msg_id)
-            time.sleep(0.1)
-        
-        return None
+                slot = request.msg_id & (self.RING_SIZE - 1)
+                if self._ring[slot] is request:
+                    self._ring[slot] = None
+                self._overflow.pop(request.msg_id, None)
+        return request.result
     
     def _send_notification(self, method: str, params: Dict[str, Any]) -> None:
         """Send a JSON-RPC notification (no response expected)."""
@@ -116,47 +403,99 @@ class LSPClient:
         if not self.process or not self.process.stdin:
             return
         
-        content = json.dumps(message)
-        headers = f"Content-Length: {len(content)}\r\n\r\n"
-        full_message = headers + content
+        content = _encode_message(message)
+        headers = f"Content-Length: {len(content)}\r\n\r\n".encode('ascii')
         
         try:
-            self.process.stdin.write(full_message.encode('utf-8'))
-            self.process.stdin.flush()
+            with self._write_lock:
+                if self._stdin_fd is not None:
+                    self._write_gathered([headers, content])
+                else:
+                    self.process.stdin.write(headers + content)
+                    self.process.stdin.flush()
         except Exception as e:
             self._log(f"Error sending message: {e}")
     
+    def _write_gathered(self, chunks: List[bytes]) -> None:
+        """Write header and body with os.writev, avoiding a concatenation copy."""
+        buffers = [memoryview(chunk) for chunk in chunks]
+        while buffers:
+            written = os.writev(self._stdin_fd, buffers)
+            # Drop fully written buffers and trim a partially written one
+            while buffers and written >= len(buffers[0]):
+                written -= len(buffers[0])
+                buffers.pop(0)
+            if written:
+                buffers[0] = buffers[0][written:]
+    
     def _read_responses(self) -> None:
         """Read responses from LSP server."""
-        while self.process and self.process.poll() is None:
+        fd = self.process.stdout.fileno()
+        while True:
             try:
-                # Read headers
-                headers = b""
-                while True:
-                    byte = self.process.stdout.read(1)
-                    if not byte:
-                        break
-                    headers += byte
-                    if headers.endswith(b"\r\n\r\n"):
-                        break
-                
-                # Parse Content-Length
+                data = os.read(fd, _READ_CHUNK)
+            except OSError:
+                return
+            if not data:
+                return
+            self._feed(data)
+    
+    def _feed(self, data: bytes) -> None:
+        """
+        Consume raw bytes from the server and dispatch complete messages.
+        
+        Framing state is kept between calls, so data may be split at any
+        byte boundary; this lets a shared reader hand over whatever a single
+        non-blocking read returned.
+        """
+        buf = self._read_buffer
+        buf += data
+        while True:
+            if self._content_length is None:
+                header_end = buf.find(b"\r\n\r\n")
+                if header_end < 0:
+                    return
                 content_length = 0
-                for line in headers.decode('utf-8', errors='ignore').split('\r\n'):
-                    if line.startswith('Content-Length:'):
-                        content_length = int(line.split(':')[1].strip())
-                
-                # Read content
-                if content_length > 0:
-                    content = self.process.stdout.read(content_length)
-                    message = json.loads(content.decode('utf-8'))
-                    
-                    if 'id' in message:
-                        with self._lock:
-                            self._responses[message['id']] = message.get('result')
-                    
-            except Exception as e:
-                self._log(f"Error reading response: {e}")
+                for line in bytes(buf[:header_end]).split(b"\r\n"):
+                    if line.startswith(b"Content-Length:"):
+                        content_length = int(line[15:])
+                del buf[:header_end + 4]
+                self._content_length = content_length
+            
+            if len(buf) < self._content_length:
+                return
+            content = bytes(buf[:self._content_length])
+            del buf[:self._content_length]
+            self._content_length = None
+            
+            # Only responses are consumed; notifications (logMessage,
+            # $/progress, publishDiagnostics, ...) are discarded unparsed.
+            # Every response carries an "id" key, so a body without one
+            # cannot be a response
+            if content and b'"id"' in content:
+                try:
+                    self._dispatch(_decode_message(content))
+                except Exception as e:
+                    self._log(f"Error reading response: {e}")
+    
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        """Hand a decoded response to the request waiting on it."""
+        msg_id = message.get('id')
+        # Server-to-client requests also carry an id, but have a method
+        if not isinstance(msg_id, int) or 'method' in message:
+            return
+        
+        with self._lock:
+            slot = msg_id & (self.RING_SIZE - 1)
+            request = self._ring[slot]
+            if request is not None and request.msg_id == msg_id:
+                self._ring[slot] = None
+            else:
+                request = self._overflow.pop(msg_id, None)
+            if request is None:
+                return
+            request.result = message.get('result')
+        request.event.set()
     
     def _initialize(self) -> None:
         """Send initialize request."""
@@ -178,21 +517,55 @@ class LSPClient:
         
         result = self._send_request("initialize", params)
         if result:
+            sync = result.get("capabilities", {}).get("textDocumentSync", 1)
+            self._sync_kind = sync.get("change", 1) if isinstance(sync, dict) else sync
             self._send_notification("initialized", {})
             self._log("LSP server initialized")
     
-    def open_document(self, file_path: Path, language_id: str, content: str) -> None:
-        """Open a document in the LSP server."""
+    def open_document(self, file_path: Path, language_id: str, content: Optional[str] = None) -> None:
+        """
+        Open a document in the LSP server.
+        
+        Documents are only sent once; later calls are no-ops until the file's
+        mtime changes, at which point the edit is sent via didChange - as a
+        single line-range patch if the server supports incremental sync,
+        otherwise as the full new text.
+        
+        Args:
+            file_path: Path to the document
+            language_id: LSP language identifier
+            content: Document text (read from disk if not provided)
+        """
         uri = f"file://{file_path}"
-        params = {
-            "textDocument": {
-                "uri": uri,
-                "languageId": language_id,
-                "version": 1,
-                "text": content
-            }
-        }
-        self._send_notification("textDocument/didOpen", params)
+        mtime = file_path.stat().st_mtime
+        opened = self._opened.get(uri)
+        if opened and opened[0] == mtime:
+            return
+        
+        if content is None:
+            content = file_path.read_text()
+        
+        if opened:
+            version = opened[1] + 1
+            if self._sync_kind == 2:
+                change = _incremental_change(opened[2], content)
+            else:
+                change = {"text": content}
+            self._send_notification("textDocument/didChange", {
+                "textDocument": {"uri": uri, "version": version},
+                "contentChanges": [change]
+            })
+        else:
+            version = 1
+            self._send_notification("textDocument/didOpen", {
+                "textDocument": {
+                    "uri": uri,
+                    "languageId": language_id,
+                    "version": version,
+                    "text": content
+                }
+            })
+        self._opened[uri] = (mtime, version, content)
     
     def get_definition(self, file_path: Path, line: int, character: int) -> List[Dict[str, Any]]:
         """Get definition locations."""
@@ -203,6 +576,34 @@ class LSPClient:
         }
         
         result = self._send_request("textDocument/definition", params)
+        return self._definition_result(result)
+    
+    def get_definitions_batch(self, requests: List[Tuple[Path, int, int]]) -> List[List[Dict[str, Any]]]:
+        """
+        Get definition locations for several positions at once.
+        
+        All requests are pipelined to the server before any response is
+        awaited.
+        
+        Args:
+            requests: List of (file_path, line, character) tuples
+        
+        Returns:
+            Definition locations for each request, in request order
+        """
+        handles = []
+        for file_path, line, character in requests:
+            params = {
+                "textDocument": {"uri": f"file://{file_path}"},
+                "position": {"line": line, "character": character}
+            }
+            handles.append(self._send_request_async("textDocument/definition", params))
+        
+        return [self._definition_result(self._wait_response(handle)) for handle in handles]
+    
+    @staticmethod
+    def _definition_result(result: Any) -> List[Dict[str, Any]]:
+        """Normalize a definition response to a list of locations."""
         if not result:
             return []
         
@@ -254,17 +655,20 @@ class LSPClient:
         if not isinstance(items, list):
             items = [items]
         
-        results = []
+        # Pipeline every hierarchy request before waiting on any of them
+        handles = []
         for item in items:
             if direction in ("incoming", "both"):
-                incoming = self._send_request("callHierarchy/incomingCalls", {"item": item})
-                if incoming:
-                    results.extend(incoming if isinstance(incoming, list) else [incoming])
+                handles.append(self._send_request_async("callHierarchy/incomingCalls", {"item": item}))
             
             if direction in ("outgoing", "both"):
-                outgoing = self._send_request("callHierarchy/outgoingCalls", {"item": item})
-                if outgoing:
-                    results.extend(outgoing if isinstance(outgoing, list) else [outgoing])
+                handles.append(self._send_request_async("callHierarchy/outgoingCalls", {"item": item}))
+        
+        results = []
+        for handle in handles:
+            calls = self._wait_response(handle)
+            if calls:
+                results.extend(calls if isinstance(calls, list) else [calls])
         
         return results
 
@@ -311,24 +715,53 @@ class LSPProvider(SemanticProvider):
         super().__init__(repo_root, verbose)
         self.configs = configs
         self.clients: Dict[str, LSPClient] = {}
+        self._reader: Optional[LSPReader] = None
+        # str(path) -> (mtime, symbols) for get_document_symbols
+        self._doc_symbol_cache: Dict[str, Tuple[float, List[SymbolInfo]]] = {}
+        # Lowercase extension -> (client, language_id), built in initialize()
+        self._ext_to_client: Dict[str, Tuple[LSPClient, str]] = {}
         self._name = "lsp"
     
     def initialize(self) -> "LSPProvider":
         """Initialize all LSP clients."""
         self._log("Initializing LSP provider")
         
-        for lang, config in self.configs.items():
-            client = LSPClient(
-                command=config["command"],
-                workspace=self.repo_root,
-                verbose=self.verbose
-            )
+        # One thread reads every server's responses where pipes can be polled
+        if self._reader is None and LSPReader.is_supported():
+            self._reader = LSPReader()
+        
+        # Start servers concurrently; each handshake can take seconds
+        with ThreadPoolExecutor(max_workers=max(len(self.configs), 1)) as executor:
+            future_to_client = {}
+            for lang, config in self.configs.items():
+                client = LSPClient(
+                    command=config["command"],
+                    workspace=self.repo_root,
+                    verbose=self.verbose,
+                    reader=self._reader
+                )
+                future_to_client[executor.submit(client.start)] = (lang, client)
             
-            if client.start():
-                self.clients[lang] = client
-                self._log(f"Started LSP server for {lang}")
-            else:
-                self._log(f"Failed to start LSP server for {lang}")
+            for future in as_completed(future_to_client):
+                lang, client = future_to_client[future]
+                if future.result():
+                    self.clients[lang] = client
+                    self._log(f"Started LSP server for {lang}")
+                else:
+                    self._log(f"Failed to start LSP server for {lang}")
+        
+        # The first config listing an extension owns it, even if its
+        # server failed to start
+        claimed = set()
+        for lang, config in self.configs.items():
+            client = self.clients.get(lang)
+            for ext in config.get("extensions", []):
+                ext = ext.lower()
+                if ext in claimed:
+                    continue
+                claimed.add(ext)
+                if client:
+                    self._ext_to_client[ext] = (client, config.get("language_id", lang))
         
         self._initialized = True
         return self
@@ -339,35 +772,36 @@ class LSPProvider(SemanticProvider):
             self._log(f"Stopping LSP server for {lang}")
             client.stop()
         self.clients.clear()
+        self._ext_to_client.clear()
+        self._doc_symbol_cache.clear()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
     
     def _get_client_for_file(self, file: Path) -> Optional[LSPClient]:
         """Get appropriate LSP client for a file."""
-        ext = file.suffix.lower()
-        
-        for lang, config in self.configs.items():
-            if ext in config.get("extensions", []):
-                return self.clients.get(lang)
-        
-        return None
+        entry = self._ext_to_client.get(file.suffix.lower())
+        return entry[0] if entry else None
     
     def _lsp_location_to_location(self, loc: Dict[str, Any]) -> Optional[Location]:
         """Convert LSP location to our Location type."""
         try:
-            uri = loc.get("uri", "")
-            if uri.startswith("file://"):
-                file_path = uri[7:]
-            else:
-                file_path = uri
+            return _location(loc)
+        except (KeyError, TypeError, AttributeError):
+            pass
+        
+        # Tolerant path for partial locations (e.g. call ranges without
+        # positions): missing fields default to zero
+        try:
+            file_path = _uri_to_path(loc.get("uri", ""))
             
             rng = loc.get("range", {})
-            start = rng.get("start", {})
-            end = rng.get("end", {})
             
             return Location(
                 file=file_path,
                 range=Range(
-                    start=Position(line=start.get("line", 0), character=start.get("character", 0)),
-                    end=Position(line=end.get("line", 0), character=end.get("character", 0))
+                    start=_to_position(rng.get("start")),
+                    end=_to_position(rng.get("end"))
                 )
             )
         except Exception as e:
@@ -376,20 +810,30 @@ class LSPProvider(SemanticProvider):
     
     def _lsp_symbol_to_symbol_info(self, sym: Dict[str, Any]) -> Optional[SymbolInfo]:
         """Convert LSP symbol to our SymbolInfo type."""
+        try:
+            location = _location(sym["location"])
+            name = sym["name"]
+            return SymbolInfo(
+                id=f"{location.file}:{name}:{location.range.start.line}",
+                name=name,
+                kind=sym.get("kind", "unknown"),
+                location=location,
+                signature=sym.get("detail"),
+                docstring=None  # LSP doesn't always provide this directly
+            )
+        except (KeyError, TypeError, AttributeError):
+            pass
+        
+        # Tolerant path for partial symbols: missing fields get defaults
         try:
             loc = sym.get("location", {})
-            uri = loc.get("uri", "")
-            if uri.startswith("file://"):
-                file_path = uri[7:]
-            else:
-                file_path = uri
+            file_path = _uri_to_path(loc.get("uri", ""))
             
             rng = loc.get("range", {})
-            start = rng.get("start", {})
-            end = rng.get("end", {})
+            start = _to_position(rng.get("start"))
             
             # Build unique ID
-            symbol_id = f"{file_path}:{sym.get('name')}:{start.get('line', 0)}"
+            symbol_id = f"{file_path}:{sym.get('name')}:{start.line}"
             
             return SymbolInfo(
                 id=symbol_id,
@@ -398,8 +842,8 @@ class LSPProvider(SemanticProvider):
                 location=Location(
                     file=file_path,
                     range=Range(
-                        start=Position(line=start.get("line", 0), character=start.get("character", 0)),
-                        end=Position(line=end.get("line", 0), character=end.get("character", 0))
+                        start=start,
+                        end=_to_position(rng.get("end"))
                     )
                 ),
                 signature=sym.get("detail"),
@@ -411,21 +855,14 @@ class LSPProvider(SemanticProvider):
     
     def get_definitions(self, file: Path, position: Position) -> List[SymbolInfo]:
         """Get symbol definitions at position."""
-        client = self._get_client_for_file(file)
-        if not client:
+        entry = self._ext_to_client.get(file.suffix.lower())
+        if not entry:
             return []
+        client, language_id = entry
         
         # Open document if not already open
         try:
-            content = file.read_text()
-            lang = None
-            for lang_key, config in self.configs.items():
-                if file.suffix.lower() in config.get("extensions", []):
-                    lang = config["language_id"]
-                    break
-            
-            if lang:
-                client.open_document(file, lang, content)
+            client.open_document(file, language_id)
         except Exception as e:
             self._log(f"Error opening document: {e}")
         
@@ -433,34 +870,47 @@ class LSPProvider(SemanticProvider):
         
         results = []
         for loc in locations:
-            symbol = self._lsp_symbol_to_symbol_info({
-                "location": loc,
-                "name": "definition",
-                "kind": "unknown"
-            })
-            if symbol:
-                results.append(symbol)
+            location = self._lsp_location_to_location(loc)
+            if location:
+                # Definitions come back as bare locations; wrap them directly
+                # rather than round-tripping through a synthesized symbol dict
+                results.append(SymbolInfo(
+                    id=f"{location.file}:definition:{location.range.start.line}",
+                    name="definition",
+                    kind="unknown",
+                    location=location
+                ))
         
         return results
     
-    def get_references(self, symbol_id: str) -> List[Location]:
-        """Get all references to a symbol."""
-        # Parse symbol_id to get file and position
-        parts = symbol_id.rsplit(":", 2)
-        if len(parts) < 2:
-            return []
+    def _symbol_anchor(self, symbol: Union[str, SymbolInfo]) -> Optional[Tuple[Path, int, int]]:
+        """
+        Resolve a symbol to the (file, line, character) position to query.
         
-        try:
-            file_path = Path(parts[0])
-            line = int(parts[-1])
-        except (ValueError, IndexError):
+        SymbolInfo objects carry their position already; string IDs are
+        parsed once and memoized.
+        """
+        if isinstance(symbol, SymbolInfo):
+            start = symbol.location.range.start
+            return Path(symbol.location.file), start.line, start.character
+        
+        parsed = _parse_symbol_id(symbol)
+        if parsed is None:
+            return None
+        return parsed[0], parsed[1], 0
+    
+    def get_references(self, symbol_id: Union[str, SymbolInfo]) -> List[Location]:
+        """Get all references to a symbol."""
+        anchor = self._symbol_anchor(symbol_id)
+        if anchor is None:
             return []
+        file_path, line, character = anchor
         
         client = self._get_client_for_file(file_path)
         if not client:
             return []
         
-        locations = client.get_references(file_path, line, 0)
+        locations = client.get_references(file_path, line, character)
         
         results = []
         for loc in locations:
@@ -470,24 +920,18 @@ class LSPProvider(SemanticProvider):
         
         return results
     
-    def get_call_hierarchy(self, symbol_id: str, direction: str = "both") -> Dict[str, List[CallSite]]:
+    def get_call_hierarchy(self, symbol_id: Union[str, SymbolInfo], direction: str = "both") -> Dict[str, List[CallSite]]:
         """Get call hierarchy for a symbol."""
-        # Parse symbol_id
-        parts = symbol_id.rsplit(":", 2)
-        if len(parts) < 2:
-            return {"incoming": [], "outgoing": []}
-        
-        try:
-            file_path = Path(parts[0])
-            line = int(parts[-1])
-        except (ValueError, IndexError):
+        anchor = self._symbol_anchor(symbol_id)
+        if anchor is None:
             return {"incoming": [], "outgoing": []}
+        file_path, line, character = anchor
         
         client = self._get_client_for_file(file_path)
         if not client:
             return {"incoming": [], "outgoing": []}
         
-        calls = client.get_call_hierarchy(file_path, line, 0, direction)
+        calls = client.get_call_hierarchy(file_path, line, character, direction)
         
         incoming = []
         outgoing = []
@@ -536,11 +980,24 @@ class LSPProvider(SemanticProvider):
         return []
     
     def get_document_symbols(self, file: Path) -> List[SymbolInfo]:
-        """Get all symbols in a document."""
+        """
+        Get all symbols in a document.
+        
+        Results are cached per file and reused until its mtime changes.
+        """
         client = self._get_client_for_file(file)
         if not client:
             return []
         
+        key = str(file)
+        try:
+            mtime = file.stat().st_mtime
+        except OSError:
+            mtime = None
+        cached = self._doc_symbol_cache.get(key)
+        if cached and mtime is not None and cached[0] == mtime:
+            return list(cached[1])
+        
         symbols = client.get_document_symbols(file)
         
         results = []
@@ -549,7 +1006,11 @@ class LSPProvider(SemanticProvider):
             if info:
                 results.append(info)
         
-        return results
+        # Empty results may be a timed-out request, so they are not cached
+        if results and mtime is not None:
+            self._doc_symbol_cache[key] = (mtime, results)
+        
+        return list(results)
     
     @property
     def name(self) -> str:
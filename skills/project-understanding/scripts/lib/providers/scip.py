@@ -8,23 +8,279 @@ Reference: https://github.com/sourcegraph/scip
 """
 
 import json
+import logging
+import mmap
+import re
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 import gzip
 
 try:
-    # Try to import protobuf if available
-    import importlib.util
-    HAS_PROTOBUF = importlib.util.find_spec("google.protobuf.message") is not None
+    import rapidgzip
+    RAPIDGZIP_AVAILABLE = True
 except ImportError:
-    HAS_PROTOBUF = False
+    RAPIDGZIP_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 from .base import (
     SemanticProvider, Position, Range, Location, SymbolInfo,
     CallSite, ImportInfo, EdgeConfidence
 )
 
+logger = logging.getLogger(__name__)
+
+# Whole lines mentioning a path or language field, for the heuristic scan of
+# indexes that do not decode as protobuf
+_FIELD_LINE_RE = re.compile(rb'^[^\n]*?(?:relative_path|language)[^\n]*', re.MULTILINE)
+
+# JSON indexes at least this large are streamed with ijson when available
+_STREAM_JSON_MIN_SIZE = 16 * 1024 * 1024
+
+# A JSON index opens an object with a key (or is empty). Binary indexes
+# usually start with "\n" (the metadata field tag), so a lone "{" after it
+# could just be a length byte; the following byte tells the two apart
+_JSON_START_RE = re.compile(rb'[ \t\r\n]*\{[ \t\r\n]*["}]')
+
+# Leading bytes inspected to tell a JSON index from a binary one
+_SNIFF_SIZE = 4096
+
+
+def _looks_like_json(head: Any) -> bool:
+    """Whether index bytes starting with head are JSON rather than protobuf."""
+    return _JSON_START_RE.match(bytes(head[:_SNIFF_SIZE])) is not None
+
+
+# SymbolInformation.Kind enum values from scip.proto, by the names used in
+# JSON indexes
+_SYMBOL_KIND_NAMES = {
+    7: 'Class',
+    8: 'Constant',
+    9: 'Constructor',
+    11: 'Enum',
+    12: 'EnumMember',
+    15: 'Field',
+    17: 'Function',
+    21: 'Interface',
+    25: 'Macro',
+    26: 'Method',
+    29: 'Module',
+    30: 'Namespace',
+    35: 'Package',
+    37: 'Parameter',
+    41: 'Property',
+    49: 'Struct',
+    53: 'Trait',
+    54: 'Type',
+    55: 'TypeAlias',
+    58: 'TypeParameter',
+    61: 'Variable',
+}
+
+
+def _read_varint(buf: Any, pos: int):
+    """Read a protobuf varint from buf at pos, returning (value, new_pos)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("Malformed varint")
+
+
+def _iter_fields(buf: Any, start: int, end: int):
+    """
+    Iterate protobuf fields in buf[start:end].
+    
+    Yields (field_number, value) where value is an int for varint fields and
+    a (start, end) span for length-delimited fields. Fixed-width fields are
+    skipped since SCIP does not use them.
+    """
+    pos = start
+    while pos < end:
+        tag, pos = _read_varint(buf, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if number == 0:
+            raise ValueError("Invalid field number 0")
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value = (pos, pos + length)
+            pos += length
+        elif wire_type == 1:
+            pos += 8
+            continue
+        elif wire_type == 5:
+            pos += 4
+            continue
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise ValueError("Truncated field")
+        yield number, value
+
+
+def _decode_str(buf: Any, span) -> str:
+    return buf[span[0]:span[1]].decode('utf-8', errors='replace')
+
+
+def _decode_relationship(buf: Any, start: int, end: int) -> Dict[str, Any]:
+    rel: Dict[str, Any] = {}
+    for number, value in _iter_fields(buf, start, end):
+        if number == 1:
+            rel['symbol'] = _decode_str(buf, value)
+        elif number == 2:
+            rel['is_reference'] = bool(value)
+        elif number == 3:
+            rel['is_implementation'] = bool(value)
+        elif number == 4:
+            rel['is_type_definition'] = bool(value)
+        elif number == 5:
+            rel['is_definition'] = bool(value)
+    return rel
+
+
+def _decode_symbol(buf: Any, start: int, end: int) -> Dict[str, Any]:
+    sym: Dict[str, Any] = {}
+    for number, value in _iter_fields(buf, start, end):
+        if number == 1:
+            sym['symbol'] = _decode_str(buf, value)
+        elif number == 3:
+            sym.setdefault('documentation', []).append(_decode_str(buf, value))
+        elif number == 4:
+            sym.setdefault('relationships', []).append(_decode_relationship(buf, *value))
+        elif number == 5:
+            sym['kind'] = _SYMBOL_KIND_NAMES.get(value, 'UnspecifiedKind')
+        elif number == 6:
+            sym['display_name'] = _decode_str(buf, value)
+    return sym
+
+
+def _decode_occurrence(buf: Any, start: int, end: int) -> Dict[str, Any]:
+    occ: Dict[str, Any] = {'range': []}
+    for number, value in _iter_fields(buf, start, end):
+        if number == 1:
+            if isinstance(value, int):
+                occ['range'].append(value)
+            else:
+                # Packed repeated int32
+                pos, stop = value
+                while pos < stop:
+                    item, pos = _read_varint(buf, pos)
+                    occ['range'].append(item)
+        elif number == 2:
+            occ['symbol'] = _decode_str(buf, value)
+        elif number == 3:
+            occ['symbol_roles'] = value
+    return occ
+
+
+def _decode_document(buf: Any, start: int, end: int) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {'occurrences': [], 'symbols': []}
+    for number, value in _iter_fields(buf, start, end):
+        if number == 1:
+            doc['relative_path'] = _decode_str(buf, value)
+        elif number == 2:
+            doc['occurrences'].append(_decode_occurrence(buf, *value))
+        elif number == 3:
+            doc['symbols'].append(_decode_symbol(buf, *value))
+        elif number == 4:
+            doc['language'] = _decode_str(buf, value)
+    return doc
+
+
+def _decode_metadata(buf: Any, start: int, end: int) -> Dict[str, Any]:
+    metadata: Dict[str, Any] = {}
+    for number, value in _iter_fields(buf, start, end):
+        if number == 1:
+            metadata['version'] = value
+        elif number == 2:
+            tool_info: Dict[str, Any] = {}
+            for tool_number, tool_value in _iter_fields(buf, *value):
+                if tool_number == 1:
+                    tool_info['name'] = _decode_str(buf, tool_value)
+                elif tool_number == 2:
+                    tool_info['version'] = _decode_str(buf, tool_value)
+                elif tool_number == 3:
+                    tool_info.setdefault('arguments', []).append(_decode_str(buf, tool_value))
+            metadata['tool_info'] = tool_info
+        elif number == 3:
+            metadata['project_root'] = _decode_str(buf, value)
+        elif number == 4:
+            metadata['text_document_encoding'] = value
+    return metadata
+
+
+def _decode_index(buf: Any):
+    """
+    Decode a SCIP Index message from its protobuf wire format.
+    
+    Only the fields this provider consumes are decoded. Returns a
+    (metadata, documents) tuple shaped like the JSON encoding.
+    
+    Raises:
+        ValueError: If buf is not a well-formed protobuf message
+    """
+    metadata: Dict[str, Any] = {}
+    documents: List[Dict[str, Any]] = []
+    try:
+        for number, value in _iter_fields(buf, 0, len(buf)):
+            if isinstance(value, int):
+                continue
+            if number == 1:
+                metadata = _decode_metadata(buf, *value)
+            elif number == 2:
+                documents.append(_decode_document(buf, *value))
+    except (IndexError, TypeError) as e:
+        raise ValueError(f"Malformed SCIP index: {e}") from e
+    return metadata, documents
+
+
+# SCIP symbol kind names mapped to our kinds
+_KIND_MAP = MappingProxyType({
+    'UnspecifiedKind': 'unknown',
+    'Type': 'type',
+    'Class': 'class',
+    'Enum': 'enum',
+    'Interface': 'interface',
+    'Struct': 'struct',
+    'TypeParameter': 'type_parameter',
+    'Parameter': 'parameter',
+    'Variable': 'variable',
+    'Property': 'property',
+    'EnumMember': 'enum_member',
+    'Function': 'function',
+    'Method': 'method',
+    'Constructor': 'constructor',
+    'Macro': 'macro',
+    'Module': 'module',
+    'Namespace': 'namespace',
+    'Package': 'package',
+})
+
+
+@lru_cache(maxsize=64)
+def _map_symbol_kind(kind: str) -> str:
+    """Map SCIP symbol kind to our kind."""
+    return _KIND_MAP.get(kind, kind.lower())
+
 
 @dataclass
 class SCIPDocument:
@@ -46,64 +302,75 @@ class SCIPIterator:
     def parse(self) -> bool:
         """Parse the SCIP index file."""
         try:
+            with open(self.file_path, 'rb') as f:
+                is_gzip = f.read(2) == b'\x1f\x8b'
+            
             # SCIP files can be gzipped
-            if self.file_path.suffix == '.gz':
-                with gzip.open(self.file_path, 'rb') as f:
-                    data = f.read()
+            if is_gzip or self.file_path.suffix == '.gz':
+                data = self._read_gzip()
             else:
                 with open(self.file_path, 'rb') as f:
+                    size = f.seek(0, 2)
+                    if size == 0:
+                        return True
+                    f.seek(0)
+                    if not _looks_like_json(f.read(_SNIFF_SIZE)):
+                        # Decode the binary index through a read-only mapping
+                        # instead of copying it into memory first
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            return self._parse_protobuf(mm)
+                    f.seek(0)
+                    if IJSON_AVAILABLE and size >= _STREAM_JSON_MIN_SIZE:
+                        return self._parse_json_stream(f)
                     data = f.read()
             
-            # Try protobuf parsing first
-            if HAS_PROTOBUF:
-                return self._parse_protobuf(data)
-            else:
-                # Fallback to JSON if available
+            # The encoding is told by the content, not the file name
+            if _looks_like_json(data):
                 return self._parse_json(data)
+            return self._parse_protobuf(data)
                 
-        except Exception as e:
-            print(f"Error parsing SCIP file: {e}")
+        except (OSError, EOFError, ValueError, RuntimeError, zlib.error) as e:
+            logger.error("Error parsing SCIP file %s: %s", self.file_path, e)
             return False
     
-    def _parse_protobuf(self, data: bytes) -> bool:
+    def _read_gzip(self) -> bytes:
+        """Read and decompress a gzipped index in a single pass."""
+        if RAPIDGZIP_AVAILABLE:
+            # Parallel decompression for large indexes
+            with rapidgzip.open(str(self.file_path)) as f:
+                return f.read()
+        with gzip.open(self.file_path, 'rb') as f:
+            return f.read()
+    
+    def _parse_protobuf(self, data: Union[bytes, mmap.mmap]) -> bool:
         """Parse protobuf-encoded SCIP index."""
-        # This is a simplified parser - full protobuf support would require the scip proto definitions
-        # For now, we extract basic information from the binary format
-        
         try:
-            # Check for gzip magic
-            if data[:2] == b'\x1f\x8b':
-                data = gzip.decompress(data)
-            
-            # Try to extract strings and build basic index
-            # This is a heuristic approach for when protobuf isn't available
-            offset = 0
-            while offset < len(data):
-                # Read varint for message length (simplified)
-                if offset + 1 > len(data):
-                    break
-                
-                # Look for document markers
-                chunk = data[offset:offset + 1024]
-                if b"document" in chunk or b"occurrence" in chunk:
-                    # Extract path information
-                    for line in chunk.split(b'\n'):
-                        if b'relative_path' in line or b'language' in line:
-                            try:
-                                text = line.decode('utf-8', errors='ignore')
-                                if ':' in text:
-                                    key, value = text.split(':', 1)
-                                    self._metadata[key.strip()] = value.strip()
-                            except Exception:
-                                pass
-                
-                offset += 1024
-            
+            metadata, documents = _decode_index(data)
+        except ValueError as e:
+            logger.debug("SCIP index is not well-formed protobuf: %s", e)
+            metadata, documents = {}, []
+        
+        if not metadata and not documents:
+            # Not a well-formed index, fall back to scanning for fields
+            self._scan_metadata(data)
             return True
-            
-        except Exception as e:
-            print(f"Error in protobuf parsing: {e}")
-            return False
+        
+        self._metadata = metadata
+        for doc in documents:
+            self._add_document(doc)
+        
+        return True
+    
+    def _scan_metadata(self, data: Union[bytes, mmap.mmap]) -> None:
+        """Heuristically extract path/language fields from raw index bytes."""
+        if data.find(b"document") < 0 and data.find(b"occurrence") < 0:
+            return
+        
+        for match in _FIELD_LINE_RE.finditer(data):
+            text = match.group().decode('utf-8', errors='ignore')
+            if ':' in text:
+                key, value = text.split(':', 1)
+                self._metadata[key.strip()] = value.strip()
     
     def _parse_json(self, data: bytes) -> bool:
         """Parse JSON-encoded SCIP index."""
@@ -115,32 +382,59 @@ class SCIPIterator:
             
             # Parse documents
             for doc in json_data.get('documents', []):
-                scip_doc = SCIPDocument(
-                    language=doc.get('language', 'unknown'),
-                    relative_path=doc.get('relative_path', ''),
-                    occurrences=doc.get('occurrences', []),
-                    symbols=doc.get('symbols', [])
-                )
-                self._documents[scip_doc.relative_path] = scip_doc
+                self._add_document(doc)
+            
+            return True
+            
+        except (ValueError, AttributeError, TypeError) as e:
+            # Invalid JSON/UTF-8, or a document layout that is not a SCIP index
+            logger.error("Error parsing JSON SCIP %s: %s", self.file_path, e)
+            return False
+    
+    def _parse_json_stream(self, f: BinaryIO) -> bool:
+        """Parse a large JSON-encoded SCIP index incrementally with ijson."""
+        try:
+            # Documents are decoded one at a time rather than materializing
+            # the whole index as a single object first
+            for doc in ijson.items(f, 'documents.item', use_float=True):
+                self._add_document(doc)
             
-            # Build symbol index
-            for doc_path, doc in self._documents.items():
-                for sym in doc.symbols:
-                    symbol_id = sym.get('symbol', '')
-                    if symbol_id:
-                        self._symbols[symbol_id] = {
-                            **sym,
-                            'document': doc_path
-                        }
+            f.seek(0)
+            for metadata in ijson.items(f, 'metadata', use_float=True):
+                self._metadata = metadata
             
             return True
             
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON SCIP: {e}")
+        except (ijson.JSONError, AttributeError, TypeError) as e:
+            logger.error("Error parsing JSON SCIP %s: %s", self.file_path, e)
             return False
     
+    def _add_document(self, doc: Dict[str, Any]) -> None:
+        """Add a decoded JSON document to the index."""
+        scip_doc = SCIPDocument(
+            language=doc.get('language', 'unknown'),
+            relative_path=doc.get('relative_path', ''),
+            occurrences=doc.get('occurrences', []),
+            symbols=doc.get('symbols', [])
+        )
+        self._documents[scip_doc.relative_path] = scip_doc
+    
+    def _index_symbols(self) -> None:
+        """Build the symbol index from parsed documents."""
+        for doc_path, doc in self._documents.items():
+            for sym in doc.symbols:
+                symbol_id = sym.get('symbol', '')
+                if symbol_id:
+                    self._symbols[symbol_id] = {
+                        **sym,
+                        'document': doc_path
+                    }
+    
     def get_symbols(self) -> Dict[str, Dict[str, Any]]:
         """Get all symbols from the index."""
+        # Built on first use; SCIPProvider indexes symbols from the documents
+        if not self._symbols and self._documents:
+            self._index_symbols()
         return self._symbols
     
     def get_documents(self) -> Dict[str, SCIPDocument]:
@@ -164,8 +458,36 @@ class SCIPProvider(SemanticProvider):
         self.scip_path = scip_path
         self._name = "scip"
         self._index: Optional[SCIPIterator] = None
-        self._symbol_cache: Dict[str, SymbolInfo] = {}
         self._location_cache: Dict[str, List[Location]] = {}
+        
+        # Reference occurrences, one row per occurrence across all documents,
+        # with each symbol's rows; Locations are built on first lookup
+        self._loc_rows: Dict[str, array] = {}
+        self._occ_files = array('I')
+        self._occ_lines = array('i')
+        self._occ_chars = array('i')
+        self._occ_end_chars = array('i')
+        
+        # Per document: occurrence (line, char) keys sorted for bisect, with
+        # each occurrence's position in the document and its symbol id
+        self._occ_by_doc: Dict[str, Tuple[List[Tuple[int, int]], List[int], List[str]]] = {}
+        
+        # Symbols are stored column-wise, one row per symbol, and only turned
+        # into SymbolInfo objects when requested
+        self._sym_index: Dict[str, int] = {}
+        self._sym_names: List[str] = []
+        self._sym_kinds = array('H')
+        self._sym_files = array('I')
+        self._sym_signatures: List[Optional[str]] = []
+        self._sym_docstrings: List[Optional[str]] = []
+        self._sym_relationships: List[List[Dict[str, Any]]] = []
+        self._kind_names: List[str] = []
+        self._file_names: List[str] = []
+        self._symbol_cache: Dict[str, SymbolInfo] = {}
+        
+        # Computed once the index is loaded
+        self._languages: List[str] = []
+        self._statistics: Dict[str, int] = {}
     
     def initialize(self) -> "SCIPProvider":
         """Load SCIP index file."""
@@ -192,6 +514,23 @@ class SCIPProvider(SemanticProvider):
         """Clear caches."""
         self._symbol_cache.clear()
         self._location_cache.clear()
+        self._loc_rows.clear()
+        self._occ_files = array('I')
+        self._occ_lines = array('i')
+        self._occ_chars = array('i')
+        self._occ_end_chars = array('i')
+        self._occ_by_doc.clear()
+        self._sym_index.clear()
+        self._sym_names.clear()
+        self._sym_kinds = array('H')
+        self._sym_files = array('I')
+        self._sym_signatures.clear()
+        self._sym_docstrings.clear()
+        self._sym_relationships.clear()
+        self._kind_names.clear()
+        self._file_names.clear()
+        self._languages = []
+        self._statistics = {}
         self._index = None
     
     def _find_scip_file(self) -> Optional[Path]:
@@ -224,74 +563,137 @@ class SCIPProvider(SemanticProvider):
         if not self._index:
             return
         
-        # Build symbol cache
-        for symbol_id, sym_data in self._index.get_symbols().items():
-            doc_path = sym_data.get('document', '')
-            full_path = str(self.repo_root / doc_path) if doc_path else ''
+        kind_ids: Dict[str, int] = {}
+        file_ids: Dict[str, int] = {}
+        
+        def file_id_for(full_path: str) -> int:
+            file_id = file_ids.get(full_path)
+            if file_id is None:
+                file_id = file_ids[full_path] = len(self._file_names)
+                self._file_names.append(full_path)
+            return file_id
+        
+        # Build symbol columns, reference rows and the per-document occurrence
+        # index used by get_definitions in one pass over the documents
+        documents = self._index.get_documents()
+        for doc_path, doc in documents.items():
+            # One shared string per document path, reused by every symbol and
+            # location in that document
+            full_path = sys.intern(str(self.repo_root / doc_path))
+            file_id = file_id_for(full_path)
+            sym_file_id = file_id if doc_path else file_id_for('')
             
-            # Parse relationships for call hierarchy
-            sym_data.get('relationships', [])
+            for sym_data in doc.symbols:
+                symbol_id = sym_data.get('symbol', '')
+                if not symbol_id:
+                    continue
+                kind = _map_symbol_kind(sym_data.get('kind', 'unknown'))
+                kind_id = kind_ids.get(kind)
+                if kind_id is None:
+                    kind_id = kind_ids[kind] = len(self._kind_names)
+                    self._kind_names.append(kind)
+                
+                name = sym_data.get('display_name', symbol_id.split('/')[-1] if '/' in symbol_id else symbol_id)
+                docstring = sym_data.get('documentation', [None])[0] if sym_data.get('documentation') else None
+                
+                row = self._sym_index.get(symbol_id)
+                if row is None:
+                    self._sym_index[symbol_id] = len(self._sym_names)
+                    self._sym_names.append(name)
+                    self._sym_kinds.append(kind_id)
+                    self._sym_files.append(sym_file_id)
+                    self._sym_signatures.append(sym_data.get('signature'))
+                    self._sym_docstrings.append(docstring)
+                    self._sym_relationships.append(sym_data.get('relationships', []))
+                else:
+                    # A later document redefining a symbol wins
+                    self._sym_names[row] = name
+                    self._sym_kinds[row] = kind_id
+                    self._sym_files[row] = sym_file_id
+                    self._sym_signatures[row] = sym_data.get('signature')
+                    self._sym_docstrings[row] = docstring
+                    self._sym_relationships[row] = sym_data.get('relationships', [])
             
-            self._symbol_cache[symbol_id] = SymbolInfo(
-                id=symbol_id,
-                name=sym_data.get('display_name', symbol_id.split('/')[-1] if '/' in symbol_id else symbol_id),
-                kind=self._map_symbol_kind(sym_data.get('kind', 'unknown')),
-                location=Location(
-                    file=full_path,
-                    range=Range(
-                        start=Position(line=0, character=0),
-                        end=Position(line=0, character=0)
-                    )
-                ),
-                signature=sym_data.get('signature'),
-                docstring=sym_data.get('documentation', [None])[0] if sym_data.get('documentation') else None
-            )
-        
-        # Build location cache for references
-        for doc_path, doc in self._index.get_documents().items():
-            for occ in doc.occurrences:
+            doc_occurrences = []
+            for order, occ in enumerate(doc.occurrences):
                 symbol_id = occ.get('symbol', '')
                 if symbol_id:
-                    if symbol_id not in self._location_cache:
-                        self._location_cache[symbol_id] = []
+                    rows = self._loc_rows.get(symbol_id)
+                    if rows is None:
+                        rows = self._loc_rows[symbol_id] = array('I')
                     
                     # Parse occurrence range
                     range_data = occ.get('range', [0, 0, 0])
                     if len(range_data) >= 2:
                         line, char = range_data[0], range_data[1]
-                        self._location_cache[symbol_id].append(
-                            Location(
-                                file=str(self.repo_root / doc_path),
-                                range=Range(
-                                    start=Position(line=line, character=char),
-                                    end=Position(line=line, character=char + (range_data[2] if len(range_data) > 2 else 1))
-                                )
-                            )
-                        )
-    
-    def _map_symbol_kind(self, kind: str) -> str:
-        """Map SCIP symbol kind to our kind."""
-        kind_map = {
-            'UnspecifiedKind': 'unknown',
-            'Type': 'type',
-            'Class': 'class',
-            'Enum': 'enum',
-            'Interface': 'interface',
-            'Struct': 'struct',
-            'TypeParameter': 'type_parameter',
-            'Parameter': 'parameter',
-            'Variable': 'variable',
-            'Property': 'property',
-            'EnumMember': 'enum_member',
-            'Function': 'function',
-            'Method': 'method',
-            'Constructor': 'constructor',
-            'Macro': 'macro',
-            'Module': 'module',
-            'Namespace': 'namespace',
-            'Package': 'package',
+                        rows.append(len(self._occ_lines))
+                        self._occ_files.append(file_id)
+                        self._occ_lines.append(line)
+                        self._occ_chars.append(char)
+                        self._occ_end_chars.append(char + (range_data[2] if len(range_data) > 2 else 1))
+                        doc_occurrences.append(((line, char), order, symbol_id))
+            
+            doc_occurrences.sort()
+            self._occ_by_doc[doc_path] = (
+                [key for key, _, _ in doc_occurrences],
+                [order for _, order, _ in doc_occurrences],
+                [symbol_id for _, _, symbol_id in doc_occurrences],
+            )
+        
+        # Infer languages from documents
+        self._languages = list(set(doc.language for doc in documents.values()))
+        self._statistics = {
+            "symbols": len(self._sym_index),
+            "documents": len(documents),
+            "cached_symbols": len(self._sym_index),
+            "cached_locations": len(self._loc_rows)
         }
-        return kind_map.get(kind, kind.lower())
+    
+    def _make_symbol_info(self, row: int, symbol_id: str) -> SymbolInfo:
+        """Materialize the SymbolInfo stored at a row of the symbol columns."""
+        return SymbolInfo(
+            id=symbol_id,
+            name=self._sym_names[row],
+            kind=self._kind_names[self._sym_kinds[row]],
+            location=Location(
+                file=self._file_names[self._sym_files[row]],
+                range=Range(
+                    start=Position(line=0, character=0),
+                    end=Position(line=0, character=0)
+                )
+            ),
+            signature=self._sym_signatures[row],
+            docstring=self._sym_docstrings[row]
+        )
+    
+    def _get_symbol(self, symbol_id: str) -> Optional[SymbolInfo]:
+        """Get the SymbolInfo for a symbol id, building it on first use."""
+        symbol = self._symbol_cache.get(symbol_id)
+        if symbol is None:
+            row = self._sym_index.get(symbol_id)
+            if row is None:
+                return None
+            symbol = self._symbol_cache[symbol_id] = self._make_symbol_info(row, symbol_id)
+        return symbol
+    
+    def _get_locations(self, symbol_id: str) -> List[Location]:
+        """Get the reference Locations of a symbol, building them on first use."""
+        locations = self._location_cache.get(symbol_id)
+        if locations is None:
+            rows = self._loc_rows.get(symbol_id)
+            if rows is None:
+                return []
+            locations = self._location_cache[symbol_id] = [
+                Location(
+                    file=self._file_names[self._occ_files[row]],
+                    range=Range(
+                        start=Position(line=self._occ_lines[row], character=self._occ_chars[row]),
+                        end=Position(line=self._occ_lines[row], character=self._occ_end_chars[row])
+                    )
+                )
+                for row in rows
+            ]
+        return locations
     
     def get_definitions(self, file: Path, position: Position) -> List[SymbolInfo]:
         """Get symbol definitions at position from SCIP index."""
@@ -305,36 +707,36 @@ class SCIPProvider(SemanticProvider):
         if not doc:
             return []
         
-        # Find occurrence at position
-        for occ in doc.occurrences:
-            range_data = occ.get('range', [0, 0])
-            if len(range_data) >= 2:
-                line = range_data[0]
-                char = range_data[1]
-                
-                # Check if position is within occurrence
-                if line == position.line and abs(char - position.character) < 50:
-                    symbol_id = occ.get('symbol', '')
-                    if symbol_id and symbol_id in self._symbol_cache:
-                        return [self._symbol_cache[symbol_id]]
+        occurrences = self._occ_by_doc.get(relative_path)
+        if not occurrences:
+            return []
+        keys, orders, symbol_ids = occurrences
         
-        return []
+        # Occurrences of known symbols on the same line starting within 50
+        # characters of the position; the earliest one in the document wins
+        lo = bisect_left(keys, (position.line, position.character - 49))
+        hi = bisect_right(keys, (position.line, position.character + 49))
+        candidates = [i for i in range(lo, hi) if symbol_ids[i] in self._sym_index]
+        if not candidates:
+            return []
+        
+        best = min(candidates, key=orders.__getitem__)
+        return [self._get_symbol(symbol_ids[best])]
     
     def get_references(self, symbol_id: str) -> List[Location]:
         """Get all references to a symbol from SCIP index."""
-        return self._location_cache.get(symbol_id, [])
+        return self._get_locations(symbol_id)
     
     def get_call_hierarchy(self, symbol_id: str, direction: str = "both") -> Dict[str, List[CallSite]]:
         """Get call hierarchy from SCIP relationships."""
-        if not self._index or symbol_id not in self._symbol_cache:
+        if not self._index or symbol_id not in self._sym_index:
             return {"incoming": [], "outgoing": []}
         
         incoming = []
         outgoing = []
         
         # Get symbol data
-        sym_data = self._index.get_symbols().get(symbol_id, {})
-        relationships = sym_data.get('relationships', [])
+        relationships = self._sym_relationships[self._sym_index[symbol_id]]
         
         for rel in relationships:
             rel_symbol = rel.get('symbol', '')
@@ -343,12 +745,12 @@ class SCIPProvider(SemanticProvider):
             
             if direction in ("incoming", "both") and rel_type and not rel_def:
                 # Incoming reference
-                if rel_symbol in self._symbol_cache:
-                    caller = self._symbol_cache[rel_symbol]
-                    callee = self._symbol_cache[symbol_id]
+                if rel_symbol in self._sym_index:
+                    caller = self._get_symbol(rel_symbol)
+                    callee = self._get_symbol(symbol_id)
                     
                     # Get reference locations
-                    locations = self._location_cache.get(rel_symbol, [])
+                    locations = self._get_locations(rel_symbol)
                     for loc in locations[:5]:  # Limit to first 5
                         incoming.append(CallSite(
                             caller=caller,
@@ -359,11 +761,11 @@ class SCIPProvider(SemanticProvider):
             
             if direction in ("outgoing", "both") and rel_type:
                 # Outgoing reference
-                if rel_symbol in self._symbol_cache:
-                    caller = self._symbol_cache[symbol_id]
-                    callee = self._symbol_cache[rel_symbol]
+                if rel_symbol in self._sym_index:
+                    caller = self._get_symbol(symbol_id)
+                    callee = self._get_symbol(rel_symbol)
                     
-                    locations = self._location_cache.get(symbol_id, [])
+                    locations = self._get_locations(symbol_id)
                     for loc in locations[:5]:
                         outgoing.append(CallSite(
                             caller=caller,
@@ -372,14 +774,6 @@ class SCIPProvider(SemanticProvider):
                             confidence=EdgeConfidence.RESOLVED
                         ))
         
-        # Also check occurrences for call relationships
-        for doc_path, doc in self._index.get_documents().items():
-            for occ in doc.occurrences:
-                occ_symbol = occ.get('symbol', '')
-                if occ_symbol == symbol_id:
-                    # This file references our symbol
-                    pass
-        
         return {"incoming": incoming, "outgoing": outgoing}
     
     def resolve_imports(self, file: Path) -> List[ImportInfo]:
@@ -438,8 +832,8 @@ class SCIPProvider(SemanticProvider):
         symbols = []
         for sym_data in doc.symbols:
             symbol_id = sym_data.get('symbol', '')
-            if symbol_id in self._symbol_cache:
-                symbols.append(self._symbol_cache[symbol_id])
+            if symbol_id in self._sym_index:
+                symbols.append(self._get_symbol(symbol_id))
         
         return symbols
     
@@ -451,11 +845,7 @@ class SCIPProvider(SemanticProvider):
     def supported_languages(self) -> List[str]:
         """Get languages from SCIP metadata."""
         if self._index:
-            self._index.get_metadata()
-            # Try to infer from documents
-            docs = self._index.get_documents()
-            languages = set(doc.language for doc in docs.values())
-            return list(languages)
+            return list(self._languages)
         return []
     
     def is_available(self) -> bool:
@@ -469,16 +859,11 @@ class SCIPProvider(SemanticProvider):
     
     def get_all_symbols(self) -> Dict[str, SymbolInfo]:
         """Get all symbols from the index."""
-        return self._symbol_cache.copy()
+        return {symbol_id: self._get_symbol(symbol_id) for symbol_id in self._sym_index}
     
     def get_statistics(self) -> Dict[str, int]:
         """Get index statistics."""
-        if not self._index:
+        if not self._index or not self._statistics:
             return {"symbols": 0, "documents": 0}
         
-        return {
-            "symbols": len(self._index.get_symbols()),
-            "documents": len(self._index.get_documents()),
-            "cached_symbols": len(self._symbol_cache),
-            "cached_locations": len(self._location_cache)
-        }
+        return dict(self._statistics)
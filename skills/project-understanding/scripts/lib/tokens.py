@@ -15,9 +15,11 @@ Truncation Strategy:
 - Adds "more available" pointers when truncating
 """
 
+import io
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
 
 
 # Heuristic: average English text is ~4 characters per token
@@ -28,6 +30,18 @@ CHARS_PER_TOKEN = 3.5
 CODE_CHARS_PER_TOKEN = 3.0
 
 
+def _tokens_per_char(chars_per_token: float) -> Tuple[int, int]:
+    """Express 1 / chars_per_token as an exact (numerator, denominator) pair."""
+    ratio = Fraction(chars_per_token).limit_denominator(1000)
+    return ratio.denominator, ratio.numerator
+
+
+# Integer form of the ratios above: tokens = len(text) * num // den, which
+# equals int(len(text) / chars_per_token) without a float division
+_PROSE_RATIO = _tokens_per_char(CHARS_PER_TOKEN)
+_CODE_RATIO = _tokens_per_char(CODE_CHARS_PER_TOKEN)
+
+
 def estimate_tokens(text: str, is_code: bool = False) -> int:
     """
     Estimate the number of tokens in a text string.
@@ -55,8 +69,13 @@ def estimate_tokens(text: str, is_code: bool = False) -> int:
     if not text:
         return 0
     
-    chars_per_tok = CODE_CHARS_PER_TOKEN if is_code else CHARS_PER_TOKEN
-    return max(1, int(len(text) / chars_per_tok))
+    return _estimate_from_length(len(text), is_code)
+
+
+def _estimate_from_length(length: int, is_code: bool = False) -> int:
+    """Estimate tokens for a non-empty text of the given length."""
+    num, den = _CODE_RATIO if is_code else _PROSE_RATIO
+    return max(1, length * num // den)
 
 
 def estimate_tokens_batch(texts: List[str], is_code: bool = False) -> List[int]:
@@ -70,7 +89,8 @@ def estimate_tokens_batch(texts: List[str], is_code: bool = False) -> List[int]:
     Returns:
         List of estimated token counts
     """
-    return [estimate_tokens(t, is_code) for t in texts]
+    num, den = _CODE_RATIO if is_code else _PROSE_RATIO
+    return [max(1, len(t) * num // den) if t else 0 for t in texts]
 
 
 @dataclass
@@ -79,6 +99,7 @@ class Section:
     header: str
     content: str
     priority: int = 0
+    order: int = 0  # Position of the section in the source text
     
     def total_text(self) -> str:
         """Get the full text including header."""
@@ -86,7 +107,15 @@ class Section:
     
     def token_count(self, is_code: bool = False) -> int:
         """Estimate tokens in this section."""
-        return estimate_tokens(self.total_text(), is_code)
+        # Same as estimate_tokens(self.total_text()) without building the text
+        return _estimate_from_length(len(self.header) + 1 + len(self.content), is_code)
+
+
+# Start of a markdown header line (#, ## or ###, but not ####)
+_SECTION_RE = re.compile(r'^#{1,3}(?=[^#])', re.MULTILINE)
+
+# Priority by header level ("# " title, "## " section, "### " subsection)
+_HEADER_PRIORITY = (0, 10, 5, 3)
 
 
 def parse_sections(text: str) -> List[Section]:
@@ -102,29 +131,27 @@ def parse_sections(text: str) -> List[Section]:
     sections = []
     
     # Split on markdown headers (## Header or ### Header)
-    pattern = r'\n(?=#{1,3}[^#])'
-    parts = re.split(pattern, '\n' + text)
+    starts = [m.start() for m in _SECTION_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
     
-    for part in parts:
-        part = part.strip()
+    for start, end in zip(starts, starts[1:]):
+        part = text[start:end].strip()
         if not part:
             continue
         
         # Extract header
-        lines = part.split('\n', 1)
-        header = lines[0].strip()
-        content = lines[1] if len(lines) > 1 else ''
+        header, _, content = part.partition('\n')
+        header = header.strip()
         
         # Determine priority based on header level
+        level = len(header) - len(header.lstrip('#'))
         priority = 0
-        if header.startswith('# '):
-            priority = 10  # Title - never truncate
-        elif header.startswith('## '):
-            priority = 5   # Major section
-        elif header.startswith('### '):
-            priority = 3   # Subsection
+        if level < len(_HEADER_PRIORITY) and header[level:level + 1] == ' ':
+            priority = _HEADER_PRIORITY[level]
         
-        sections.append(Section(header=header, content=content, priority=priority))
+        sections.append(Section(header=header, content=content, priority=priority, order=len(sections)))
     
     return sections
 
@@ -162,6 +189,11 @@ def truncate_to_budget(
     if not text:
         return ''
     
+    # At most 3 chars per token always estimates within budget for both prose
+    # and code, so short text needs no estimate at all
+    if len(text) <= budget_tokens * 3:
+        return text
+    
     current_tokens = estimate_tokens(text, is_code)
     
     # If within budget, return as-is
@@ -175,19 +207,25 @@ def truncate_to_budget(
         # No sections found, do simple truncation
         return _simple_truncate(text, budget_tokens, is_code)
     
-    # Sort by priority (higher priority first if preserving)
+    # Visit by priority (higher priority first if preserving). Priorities take
+    # only a few values, so bucket the sections; each bucket keeps document order
     if preserve_priority:
-        sections.sort(key=lambda s: -s.priority)
-    
-    # Keep sections until budget exhausted
-    result_sections = []
+        buckets: Dict[int, List[Section]] = {}
+        for section in sections:
+            buckets.setdefault(section.priority, []).append(section)
+        ordered = [s for priority in sorted(buckets, reverse=True) for s in buckets[priority]]
+    else:
+        ordered = sections
+    
+    # Keep sections until budget exhausted, slotted by original position
+    kept: List[Optional[Section]] = [None] * len(sections)
     used_tokens = 0
     
-    for section in sections:
+    for section in ordered:
         section_tokens = section.token_count(is_code)
         
         if used_tokens + section_tokens <= budget_tokens:
-            result_sections.append(section)
+            kept[section.order] = section
             used_tokens += section_tokens
         else:
             # Try to partially include this section
@@ -195,14 +233,21 @@ def truncate_to_budget(
             if remaining > 50:  # Only if we have reasonable space
                 partial = _truncate_section(section, remaining, is_code)
                 if partial:
-                    result_sections.append(partial)
+                    kept[section.order] = partial
             break
     
-    # Sort back to original order
-    result_sections.sort(key=lambda s: text.find(s.header))
+    # Back in original order
+    result_sections = [s for s in kept if s is not None]
     
-    # Build result
-    result = '\n\n'.join(s.total_text() for s in result_sections)
+    # Build result, writing each section straight into one buffer
+    buf = io.StringIO()
+    for i, section in enumerate(result_sections):
+        if i:
+            buf.write('\n\n')
+        buf.write(section.header)
+        buf.write('\n')
+        buf.write(section.content)
+    result = buf.getvalue()
     
     # Add truncation notice
     if estimate_tokens(result, is_code) < current_tokens:
@@ -274,7 +319,8 @@ def _truncate_section(section: Section, budget_tokens: int, is_code: bool = Fals
         return Section(
             header=section.header,
             content=content,
-            priority=section.priority
+            priority=section.priority,
+            order=section.order
         )
     
     return None
@@ -8,7 +8,12 @@ Provides:
 - Integration with Indexer
 """
 
+import hashlib
+import math
 import os
+import queue
+import re
+import sys
 import time
 import threading
 from pathlib import Path
@@ -23,14 +28,81 @@ except ImportError:
     WATCHDOG_AVAILABLE = False
     FileSystemEventHandler = object
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows
+    import msvcrt
+    FCNTL_AVAILABLE = False
 
-@dataclass
+
+class DistinctCounter:
+    """
+    Counts distinct strings in bounded memory.
+    
+    Counts exactly up to EXACT_LIMIT items, then switches to a HyperLogLog
+    sketch of 2**PRECISION one-byte registers (4 KB, about 1.6% standard
+    error), so a long watch session doesn't keep every path it has seen.
+    """
+    
+    EXACT_LIMIT = 10000
+    PRECISION = 12
+    
+    __slots__ = ("_exact", "_registers")
+    
+    def __init__(self):
+        self._exact: Optional[Set[str]] = set()
+        self._registers: Optional[bytearray] = None
+    
+    def add(self, item: str) -> None:
+        """Record an item."""
+        if self._exact is None:
+            self._add_to_sketch(item)
+            return
+        
+        self._exact.add(item)
+        if len(self._exact) > self.EXACT_LIMIT:
+            self._registers = bytearray(1 << self.PRECISION)
+            for seen in self._exact:
+                self._add_to_sketch(seen)
+            self._exact = None
+    
+    def _add_to_sketch(self, item: str) -> None:
+        """Fold an item into the HyperLogLog registers."""
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        rest_bits = 64 - self.PRECISION
+        index = h >> rest_bits
+        # Position of the leftmost 1-bit in the remaining bits
+        rank = rest_bits - (h & ((1 << rest_bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+    
+    def __len__(self) -> int:
+        """Number of distinct items (estimated past EXACT_LIMIT)."""
+        if self._exact is not None:
+            return len(self._exact)
+        
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+@dataclass(slots=True)
 class WatchStats:
     """Statistics for watch mode."""
     events_received: int = 0
+    events_dropped: int = 0
     updates_triggered: int = 0
     updates_completed: int = 0
-    files_changed: Set[str] = field(default_factory=set)
+    updates_failed: int = 0
+    files_changed: DistinctCounter = field(default_factory=DistinctCounter)
     start_time: float = field(default_factory=time.time)
     last_update: Optional[float] = None
     
@@ -50,8 +122,10 @@ class WatchStats:
         """Convert to dictionary."""
         return {
             'events_received': self.events_received,
+            'events_dropped': self.events_dropped,
             'updates_triggered': self.updates_triggered,
             'updates_completed': self.updates_completed,
+            'updates_failed': self.updates_failed,
             'files_changed': len(self.files_changed),
             'duration_seconds': round(self.duration, 2),
             'update_rate_per_min': round(self.update_rate, 2),
@@ -63,8 +137,10 @@ class WatchStats:
         lines = [
             "Watch Statistics:",
             f"  Events received: {self.events_received}",
+            f"  Events dropped: {self.events_dropped}",
             f"  Updates triggered: {self.updates_triggered}",
             f"  Updates completed: {self.updates_completed}",
+            f"  Updates failed: {self.updates_failed}",
             f"  Unique files changed: {len(self.files_changed)}",
             f"  Duration: {self.duration:.2f}s",
             f"  Update rate: {self.update_rate:.2f}/min",
@@ -73,83 +149,112 @@ class WatchStats:
 
 
 class IndexLock:
-    """File-based lock for index access."""
+    """
+    File-based lock for index access.
+    
+    Uses an OS advisory lock on the lock file (flock on POSIX, msvcrt on
+    Windows), so waiting happens in the kernel and a lock held by a process
+    that dies is released with its file descriptor. The file itself is kept
+    and holds the owner's PID for information only.
+    
+    Readers can take the lock shared, so they only exclude writers. Windows
+    has no shared file locks, so there shared locks are exclusive.
+    """
+    
+    # Poll interval while waiting with a timeout or on Windows
+    POLL_INTERVAL = 0.05
     
     def __init__(self, lock_path: Path):
         self.lock_path = Path(lock_path)
         self._held = False
         self._pid = os.getpid()
+        self._fd: Optional[int] = None
+        self._shared = False
     
-    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
-        """Acquire the lock."""
-        if self._held:
+    def _try_lock(self, fd: int, blocking: bool, shared: bool) -> bool:
+        """Lock fd, returning False if it is held elsewhere and not blocking."""
+        try:
+            if FCNTL_AVAILABLE:
+                mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                fcntl.flock(fd, mode | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
             return True
+        except OSError:
+            if blocking and FCNTL_AVAILABLE:
+                raise
+            return False
+    
+    def acquire(
+        self,
+        blocking: bool = True,
+        timeout: Optional[float] = None,
+        shared: bool = False
+    ) -> bool:
+        """
+        Acquire the lock.
         
-        start_time = time.time()
+        Args:
+            blocking: Wait for the lock instead of failing immediately
+            timeout: Maximum seconds to wait when blocking (None = forever)
+            shared: Take a shared (reader) lock instead of an exclusive one
+        """
+        if self._held:
+            return True
         
-        while True:
-            try:
-                # Try to create lock file exclusively
-                fd = os.open(
-                    str(self.lock_path),
-                    os.O_CREAT | os.O_EXCL | os.O_WRONLY
-                )
-                
-                # Write our PID
-                os.write(fd, str(self._pid).encode())
-                os.close(fd)
-                
-                self._held = True
-                return True
-                
-            except FileExistsError:
-                # Lock is held by someone else
+        fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT)
+        try:
+            # Let the kernel do the waiting when there is no deadline
+            wait_in_kernel = blocking and timeout is None and FCNTL_AVAILABLE
+            deadline = None if timeout is None else time.monotonic() + timeout
+            
+            while not self._try_lock(fd, wait_in_kernel, shared):
                 if not blocking:
+                    os.close(fd)
                     return False
-                
-                # Check timeout
-                if timeout is not None and (time.time() - start_time) > timeout:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
                     return False
-                
-                # Check for stale lock
-                try:
-                    with open(self.lock_path, 'r') as f:
-                        lock_pid = int(f.read().strip())
-                    
-                    # Check if process still exists
-                    try:
-                        os.kill(lock_pid, 0)
-                    except OSError:
-                        # Process doesn't exist, remove stale lock
-                        try:
-                            os.remove(self.lock_path)
-                            continue
-                        except OSError:
-                            pass
-                except (ValueError, FileNotFoundError):
-                    pass
-                
-                # Wait before retry
-                time.sleep(0.1)
+                time.sleep(self.POLL_INTERVAL)
+            
+            if not shared:
+                # Record our PID
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, str(self._pid).encode())
+        except BaseException:
+            os.close(fd)
+            raise
+        
+        self._fd = fd
+        self._shared = shared
+        self._held = True
+        return True
     
     def release(self) -> bool:
         """Release the lock."""
         if not self._held:
             return True
         
+        fd = self._fd
+        self._fd = None
+        self._held = False
         try:
-            # Verify we own the lock
-            with open(self.lock_path, 'r') as f:
-                lock_pid = f.read().strip()
-            
-            if int(lock_pid) == self._pid:
-                os.remove(self.lock_path)
-                self._held = False
-                return True
-        except (ValueError, FileNotFoundError, OSError):
+            if not self._shared:
+                os.ftruncate(fd, 0)
+            if FCNTL_AVAILABLE:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
             pass
+        finally:
+            # Closing the descriptor drops the lock in any case
+            os.close(fd)
         
-        return False
+        return True
     
     def __enter__(self):
         self.acquire()
@@ -159,6 +264,64 @@ class IndexLock:
         self.release()
 
 
+# Editor swap/backup files and atomic-save temporaries
+_TEMP_SUFFIXES = ('.swp', '.swx', '.tmp', '~', '___jb_tmp___', '___jb_old___')
+
+
+def _is_editor_temp(path: str) -> bool:
+    """Check for editor temp files, including emacs '.#name' lock files."""
+    return path.endswith(_TEMP_SUFFIXES) or os.path.basename(path).startswith('.#')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob to a regex whose wildcards stay within one path component."""
+    sep = re.escape(os.sep)
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            out.append(f'[^{sep}]*')
+        elif c == '?':
+            out.append(f'[^{sep}]')
+        elif c == '[':
+            # ']' right after '[' or '[!' is a member of the set
+            j = i
+            if pattern[j:j + 1] == '!':
+                j += 1
+            if pattern[j:j + 1] == ']':
+                j += 1
+            j = pattern.find(']', j)
+            if j < 0:
+                out.append(re.escape(c))
+                continue
+            body = re.sub(r'([\\&~|\[])', r'\\\1', pattern[i:j])
+            i = j + 1
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            elif body.startswith('^'):
+                body = '\\' + body
+            out.append(f'[{body}]')
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def _compile_ignore_patterns(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """
+    Compile ignore globs into one regex matched against whole paths.
+    
+    A pattern matches when it covers one or more complete path components,
+    e.g. '.git' matches 'src/.git/config' and '*.min.js' matches 'dist/app.min.js'.
+    """
+    if not patterns:
+        return None
+    sep = re.escape(os.sep)
+    alternatives = '|'.join(f'(?:{_glob_to_regex(p)})' for p in patterns)
+    return re.compile(f'(?:^|{sep})(?:{alternatives})(?=$|{sep})')
+
+
 class FileChangeHandler(FileSystemEventHandler):
     """Handles file change events."""
     
@@ -174,42 +337,51 @@ class FileChangeHandler(FileSystemEventHandler):
             'node_modules', '.venv', 'venv', '.env'
         ]
         self.extensions = extensions or {'.py', '.js', '.ts', '.rs', '.go', '.java'}
+        
+        # Lookup forms of the above for the per-event checks
+        self._ignore_re = _compile_ignore_patterns(self.ignore_patterns)
+        self._ext_suffixes = tuple(self.extensions)
     
     def _should_ignore(self, path: str) -> bool:
         """Check if path should be ignored."""
-        path_parts = path.split(os.sep)
+        if _is_editor_temp(path):
+            return True
         
         # Check ignore patterns
-        for pattern in self.ignore_patterns:
-            if pattern in path_parts:
-                return True
+        if self._ignore_re is not None and self._ignore_re.search(path):
+            return True
         
         # Check extension
-        if self.extensions:
-            if not any(path.endswith(ext) for ext in self.extensions):
-                return True
+        if self._ext_suffixes and not path.endswith(self._ext_suffixes):
+            return True
         
         return False
     
+    # Callbacks run on the observer thread, so they only drop editor temp
+    # files and hand the event on; the rest of the path filtering is left to
+    # the receiver (see WatchMode._consume)
     def on_modified(self, event):
-        if isinstance(event, FileModifiedEvent):
-            if not self._should_ignore(event.src_path):
-                self.callback('modified', event.src_path)
+        if isinstance(event, FileModifiedEvent) and not _is_editor_temp(event.src_path):
+            self.callback('modified', event.src_path)
     
     def on_created(self, event):
-        if isinstance(event, FileCreatedEvent):
-            if not self._should_ignore(event.src_path):
-                self.callback('created', event.src_path)
+        if isinstance(event, FileCreatedEvent) and not _is_editor_temp(event.src_path):
+            self.callback('created', event.src_path)
     
     def on_deleted(self, event):
-        if isinstance(event, FileDeletedEvent):
-            if not self._should_ignore(event.src_path):
-                self.callback('deleted', event.src_path)
+        if isinstance(event, FileDeletedEvent) and not _is_editor_temp(event.src_path):
+            self.callback('deleted', event.src_path)
 
 
 class WatchMode:
     """Watch mode for automatic index updates."""
     
+    # Maximum number of file events waiting for the consumer thread
+    EVENT_QUEUE_SIZE = 10000
+    
+    # Longest wait before retrying a failed update, in seconds
+    MAX_RETRY_DELAY = 60.0
+    
     def __init__(
         self,
         repo_root: Path,
@@ -222,14 +394,26 @@ class WatchMode:
         self.debounce_seconds = debounce_seconds
         self.verbose = verbose
         
+        # Absolute root with a trailing separator; watched paths start with it
+        self._root_prefix = os.path.join(os.path.abspath(self.repo_root), '')
+        
         self.stats = WatchStats()
         self.lock = IndexLock(self.repo_root / ".pui" / "index.lock")
         
         self._observer: Optional[Observer] = None
+        self._handler: Optional[FileChangeHandler] = None
+        self._event_q: queue.Queue = queue.Queue(maxsize=self.EVENT_QUEUE_SIZE)
+        self._consumer: Optional[threading.Thread] = None
         self._pending_changes: Set[str] = set()
-        self._debounce_timer: Optional[threading.Timer] = None
+        self._fire_at = 0.0  # time.monotonic() deadline for pending changes
         self._running = False
         self._update_callback: Optional[Callable[[Set[str]], None]] = None
+        self._failures = 0  # consecutive failed updates, for retry backoff
+        
+        # Indexer kept open across updates; owned by the consumer thread,
+        # since its sqlite connection may only be used from one thread
+        self._indexer = None
+        self._indexer_stamp = None
     
     def _log(self, message: str) -> None:
         """Log message if verbose mode enabled."""
@@ -237,24 +421,64 @@ class WatchMode:
             print(f"[Watch] {message}")
     
     def _on_file_change(self, change_type: str, path: str) -> None:
-        """Handle a file change event."""
+        """Queue a file change event for the consumer thread."""
+        try:
+            self._event_q.put_nowait((change_type, path))
+        except queue.Full:
+            self.stats.events_dropped += 1
+    
+    def _consume(self) -> None:
+        """Filter queued events and trigger debounced updates."""
+        try:
+            self._consume_loop()
+        finally:
+            if self._indexer is not None:
+                self._indexer.close()
+                self._indexer = None
+    
+    def _consume_loop(self) -> None:
+        """Consumer thread main loop."""
+        while self._running:
+            timeout = self.debounce_seconds
+            if self._pending_changes:
+                # Fire once no change has arrived for a full debounce period
+                timeout = self._fire_at - time.monotonic()
+                if timeout <= 0:
+                    try:
+                        self._trigger_update()
+                    except Exception as e:
+                        # Keep consuming; the changes are retried later
+                        self._update_failed(e)
+                    continue
+            
+            try:
+                event = self._event_q.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if event is None:
+                # Wake-up from stop()
+                continue
+            
+            change_type, path = event
+            if self._handler is not None and self._handler._should_ignore(path):
+                continue
+            
+            self._record_change(change_type, path)
+            # New changes never shorten a pending retry backoff
+            self._fire_at = max(self._fire_at, time.monotonic() + self.debounce_seconds)
+    
+    def _record_change(self, change_type: str, path: str) -> None:
+        """Record a file change pending the next update."""
         self.stats.events_received += 1
         
-        rel_path = os.path.relpath(path, self.repo_root)
+        if path.startswith(self._root_prefix):
+            rel_path = path[len(self._root_prefix):]
+        else:
+            rel_path = os.path.relpath(path, self.repo_root)
         self._log(f"{change_type}: {rel_path}")
         
         self._pending_changes.add(rel_path)
         self.stats.files_changed.add(rel_path)
-        
-        # Debounce the update
-        if self._debounce_timer:
-            self._debounce_timer.cancel()
-        
-        self._debounce_timer = threading.Timer(
-            self.debounce_seconds,
-            self._trigger_update
-        )
-        self._debounce_timer.start()
     
     def _trigger_update(self) -> None:
         """Trigger index update."""
@@ -264,13 +488,17 @@ class WatchMode:
         changes = self._pending_changes.copy()
         self._pending_changes.clear()
         
-        self.stats.updates_triggered += 1
-        
         # Acquire lock
         if not self.lock.acquire(blocking=False):
-            self._log("Another update in progress, skipping")
+            # Held by another update or by readers; retry after another
+            # debounce period rather than losing the changes
+            self._log("Index busy, retrying later")
+            self._pending_changes.update(changes)
+            self._fire_at = time.monotonic() + self.debounce_seconds
             return
         
+        self.stats.updates_triggered += 1
+        
         try:
             self._log(f"Running update for {len(changes)} file(s)")
             
@@ -281,18 +509,59 @@ class WatchMode:
             
             self.stats.updates_completed += 1
             self.stats.last_update = time.time()
-            
+            self._failures = 0
+        except Exception:
+            # Keep the changes for the retry scheduled by the consumer loop
+            self._pending_changes.update(changes)
+            raise
         finally:
             self.lock.release()
     
+    def _update_failed(self, error: Exception) -> None:
+        """Record a failed update and schedule its retry with exponential backoff."""
+        self.stats.updates_failed += 1
+        self._failures += 1
+        delay = min(self.debounce_seconds * 2 ** self._failures, self.MAX_RETRY_DELAY)
+        print(f"[Watch] Update failed: {error}; retrying in {delay:.1f}s", file=sys.stderr)
+        self._fire_at = time.monotonic() + delay
+    
+    def _indexer_inputs_stamp(self) -> tuple:
+        """Stat of the files an Indexer reads once at initialization."""
+        stamp = []
+        for path in (self.repo_root / ".gitignore", self.repo_root / ".pui" / "config.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+    
     def _run_indexer(self, changes: Set[str]) -> None:
-        """Run the indexer."""
-        from scripts.lib.indexer import Indexer
+        """Run the indexer, reusing one Indexer while its config is unchanged."""
+        from scripts.lib.indexer import Indexer, IndexStats
+        
+        stamp = self._indexer_inputs_stamp()
+        if self._indexer is not None and stamp != self._indexer_stamp:
+            # Config or ignore rules changed; reload them with a new Indexer
+            self._indexer.close()
+            self._indexer = None
+        if self._indexer is None:
+            self._indexer = Indexer(self.repo_root, self.skill_root, self.verbose).initialize()
+            self._indexer_stamp = stamp
         
-        with Indexer(self.repo_root, self.skill_root, self.verbose) as indexer:
-            stats = indexer.run()
-            if self.verbose:
-                print(stats)
+        # Report this update's statistics and timings rather than session totals
+        self._indexer.stats = IndexStats()
+        self._indexer.timings.clear()
+        try:
+            stats = self._indexer.run()
+        except Exception:
+            # Start from a fresh connection on the consumer loop's retry
+            self._indexer.close()
+            self._indexer = None
+            raise
+        if self.verbose:
+            print(stats)
     
     def start(
         self,
@@ -314,16 +583,30 @@ class WatchMode:
         self._update_callback = update_callback
         
         # Set up file watcher
-        handler = FileChangeHandler(
+        self._handler = FileChangeHandler(
             callback=self._on_file_change,
             extensions={'.py', '.js', '.ts', '.rs', '.go', '.java'}
         )
         
+        self._running = True
+        self._consumer = threading.Thread(target=self._consume, daemon=True)
+        self._consumer.start()
+        
         self._observer = Observer()
-        self._observer.schedule(handler, str(self.repo_root), recursive=True)
+        try:
+            # Only deliver the events the handler acts on. On inotify this
+            # narrows the kernel watch mask, so the open/close events caused
+            # by reading files (including the indexer's own reads) are never
+            # queued at all
+            self._observer.schedule(
+                self._handler, self._root_prefix, recursive=True,
+                event_filter=[FileModifiedEvent, FileCreatedEvent, FileDeletedEvent]
+            )
+        except TypeError:
+            # watchdog < 4 has no event filters
+            self._observer.schedule(self._handler, self._root_prefix, recursive=True)
         self._observer.start()
         
-        self._running = True
         self._log(f"Started watching {self.repo_root}")
         print(f"Watching {self.repo_root} for changes...")
         print("Press Ctrl+C to stop")
@@ -338,13 +621,17 @@ class WatchMode:
         """Stop watching for file changes."""
         self._running = False
         
-        if self._debounce_timer:
-            self._debounce_timer.cancel()
-        
         if self._observer:
             self._observer.stop()
             self._observer.join()
         
+        if self._consumer:
+            try:
+                self._event_q.put_nowait(None)
+            except queue.Full:
+                pass
+            self._consumer.join()
+        
         self._log("Stopped watching")
         print("\nWatch mode stopped")
         print(self.stats)
@@ -7,14 +7,40 @@ Provides:
 - Cross-repo dependency analysis
 """
 
+import heapq
+import io
 import json
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 import sqlite3
+import threading
 
 
-@dataclass
+# orjson is an optional, faster drop-in for the workspace file codec
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Serialize data as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _load_json(content: bytes) -> Any:
+    """Deserialize UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+@dataclass(slots=True)
 class RepoConfig:
     """Configuration for a single repository in the workspace."""
     path: str
@@ -37,7 +63,7 @@ class RepoConfig:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkspaceConfig:
     """Configuration for a multi-repository workspace."""
     name: str
@@ -65,16 +91,16 @@ class WorkspaceConfig:
     
     def save(self, path: Path):
         """Save workspace configuration to file."""
-        path.write_text(json.dumps(self.to_dict(), indent=2))
+        path.write_bytes(_dump_json(self.to_dict()))
     
     @classmethod
     def load(cls, path: Path) -> 'WorkspaceConfig':
         """Load workspace configuration from file."""
-        data = json.loads(path.read_text())
+        data = _load_json(path.read_bytes())
         return cls.from_dict(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CrossRepoEdge:
     """Represents a dependency edge between repositories."""
     source_repo: str
@@ -95,7 +121,7 @@ class CrossRepoEdge:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedGraph:
     """Unified graph view across multiple repositories."""
     repos: List[str] = field(default_factory=list)
@@ -113,51 +139,81 @@ class UnifiedGraph:
             'repo_summaries': self.repo_summaries
         }
     
-    def to_text(self) -> str:
-        """Format as readable text."""
-        lines = [
-            "# Unified Workspace Graph",
-            "",
-            f"**Repositories**: {len(self.repos)}",
-            f"**Total Symbols**: {self.total_symbols}",
-            f"**Total Edges**: {self.total_edges}",
-            f"**Cross-Repo Dependencies**: {len(self.cross_repo_edges)}",
-            ""
-        ]
+    def to_text(self, max_edges: int = 20) -> str:
+        """Format as readable text, listing the highest-confidence edges."""
+        buf = io.StringIO()
+        w = buf.write
+        
+        w("# Unified Workspace Graph\n\n")
+        w(f"**Repositories**: {len(self.repos)}\n")
+        w(f"**Total Symbols**: {self.total_symbols}\n")
+        w(f"**Total Edges**: {self.total_edges}\n")
+        w(f"**Cross-Repo Dependencies**: {len(self.cross_repo_edges)}\n")
         
         if self.repos:
-            lines.append("## Repositories")
-            lines.append("")
+            w("\n## Repositories\n\n")
             for repo_name in self.repos:
                 summary = self.repo_summaries.get(repo_name, {})
                 symbols = summary.get('symbol_count', 0)
                 edges = summary.get('edge_count', 0)
-                lines.append(f"- **{repo_name}**: {symbols} symbols, {edges} edges")
-            lines.append("")
+                w(f"- **{repo_name}**: {symbols} symbols, {edges} edges\n")
         
         if self.cross_repo_edges:
-            lines.append("## Cross-Repository Dependencies")
-            lines.append("")
-            for edge in self.cross_repo_edges[:20]:  # Limit output
-                lines.append(
+            w("\n## Cross-Repository Dependencies\n\n")
+            # Limit output; selecting the top edges avoids sorting them all
+            top = heapq.nlargest(max_edges, self.cross_repo_edges, key=lambda e: e.confidence)
+            for edge in top:
+                w(
                     f"- `{edge.source_repo}.{edge.source_symbol}` → "
-                    f"`{edge.target_repo}.{edge.target_symbol}` ({edge.edge_type})"
+                    f"`{edge.target_repo}.{edge.target_symbol}` ({edge.edge_type})\n"
                 )
-            lines.append("")
         
-        return '\n'.join(lines)
+        return buf.getvalue()
 
 
 class WorkspaceManager:
     """Manages multi-repository workspaces."""
     
+    # Maximum threads querying repositories at once
+    MAX_QUERY_WORKERS = 8
+    
+    # SQLite's default limit on databases attached to one connection
+    ATTACH_LIMIT = 10
+    
+    # Per-connection read tuning: 256 MB memory map, 64 MB page cache
+    MMAP_SIZE = 256 * 1024 * 1024
+    CACHE_SIZE_KB = 64 * 1024
+    
     def __init__(self, config_path: Optional[Path] = None):
         self.config_path = config_path
         self.config: Optional[WorkspaceConfig] = None
+        self._conn_cache: Dict[Path, sqlite3.Connection] = {}
+        # Attached-database sessions with the symbol query for each database
+        self._session_cache: Dict[Tuple[Path, ...], Tuple[sqlite3.Connection, List[Optional[bool]]]] = {}
+        self._conn_lock = threading.Lock()
+        # Repository summaries with the database stamp they were read at
+        self._summary_cache: Dict[Path, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
         
         if config_path and config_path.exists():
             self.config = WorkspaceConfig.load(config_path)
     
+    def close(self) -> None:
+        """Close pooled repository database connections."""
+        for conn in self._conn_cache.values():
+            conn.close()
+        for conn, _ in self._session_cache.values():
+            conn.close()
+        self._conn_cache.clear()
+        self._session_cache.clear()
+    
+    def __enter__(self) -> "WorkspaceManager":
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
+    
     def create_workspace(self, name: str, repo_paths: List[Path]) -> WorkspaceConfig:
         """Create a new workspace from repository paths."""
         repos = []
@@ -208,25 +264,21 @@ class WorkspaceManager:
         
         graph = UnifiedGraph()
         
-        # Aggregate data from all repos
-        for repo in self.config.repos:
-            if not repo.enabled:
-                continue
-            
-            repo_path = Path(repo.path)
-            db_path = repo_path / ".pui" / "index.sqlite"
+        # Aggregate data from all repos, reading their databases in parallel
+        repos = self._indexed_repos()
+        if repos:
+            workers = min(self.MAX_QUERY_WORKERS, len(repos))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(self._try_repo_summary, repos))
             
-            if not db_path.exists():
-                continue
-            
-            try:
-                summary = self._get_repo_summary(db_path)
+            for (repo, _), (summary, error) in zip(repos, outcomes):
+                if error is not None:
+                    print(f"Warning: Could not analyze {repo.name}: {error}")
+                    continue
                 graph.repos.append(repo.name)
                 graph.repo_summaries[repo.name] = summary
                 graph.total_symbols += summary.get('symbol_count', 0)
                 graph.total_edges += summary.get('edge_count', 0)
-            except Exception as e:
-                print(f"Warning: Could not analyze {repo.name}: {e}")
         
         # Detect cross-repo dependencies (simplified)
         if self.config.cross_repo_analysis:
@@ -234,26 +286,91 @@ class WorkspaceManager:
         
         return graph
     
+    def _indexed_repos(self) -> List[Tuple[RepoConfig, Path]]:
+        """Enabled repositories that have an index, with their database paths."""
+        repos = []
+        for repo in self.config.repos if self.config else []:
+            if not repo.enabled:
+                continue
+            db_path = Path(repo.path) / ".pui" / "index.sqlite"
+            if db_path.exists():
+                repos.append((repo, db_path))
+        return repos
+    
+    def _try_repo_summary(
+        self,
+        item: Tuple[RepoConfig, Path]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+        """Get a repository summary, returning the error instead of raising."""
+        try:
+            return self._repo_summary(item[1]), None
+        except Exception as e:
+            return None, e
+    
+    def _repo_summary(self, db_path: Path) -> Dict[str, Any]:
+        """Get a repository summary, reusing it while the database is unchanged."""
+        # Committed writes land in the WAL file until a checkpoint, so both
+        # files identify the database contents
+        stamp: Tuple[Any, ...] = ()
+        for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+            try:
+                st = path.stat()
+                stamp += (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stamp += (None, None)
+        
+        cached = self._summary_cache.get(db_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        summary = self._get_repo_summary(db_path)
+        self._summary_cache[db_path] = (stamp, summary)
+        return summary
+    
+    def _conn(self, db_path: Path) -> sqlite3.Connection:
+        """Get the pooled read-only connection for a repository database."""
+        with self._conn_lock:
+            conn = self._conn_cache.get(db_path)
+            if conn is None:
+                # Autocommit, so no read transaction outlives a query and
+                # index updates stay visible
+                conn = sqlite3.connect(
+                    f"{db_path.absolute().as_uri()}?mode=ro",
+                    uri=True,
+                    isolation_level=None,
+                    check_same_thread=False
+                )
+                conn.execute("PRAGMA query_only = 1")
+                conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+                conn.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KB}")
+                self._conn_cache[db_path] = conn
+        return conn
+    
     def _get_repo_summary(self, db_path: Path) -> Dict[str, Any]:
         """Get summary statistics from repository database."""
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = self._conn(db_path).cursor()
         
         summary = {}
         
         try:
-            cursor.execute("SELECT COUNT(*) FROM files")
-            summary['file_count'] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM symbols")
-            summary['symbol_count'] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM edges")
-            summary['edge_count'] = cursor.fetchone()[0]
+            try:
+                # Counts maintained by the indexer's triggers
+                cursor.execute("SELECT name, cnt FROM meta_counts")
+                counts = dict(cursor.fetchall())
+                row = (counts['files'], counts['symbols'], counts['edges'])
+            except (sqlite3.OperationalError, KeyError):
+                # Index from before meta_counts; one statement for all three
+                cursor.execute(
+                    "SELECT (SELECT COUNT(*) FROM files), "
+                    "(SELECT COUNT(*) FROM symbols), "
+                    "(SELECT COUNT(*) FROM edges)"
+                )
+                row = cursor.fetchone()
+            summary['file_count'], summary['symbol_count'], summary['edge_count'] = row
         except sqlite3.OperationalError:
             pass
         finally:
-            conn.close()
+            cursor.close()
         
         return summary
     
@@ -269,44 +386,149 @@ class WorkspaceManager:
         
         return edges
     
+    def _attach(self, conn: sqlite3.Connection, i: int, db_path: Path) -> Optional[bool]:
+        """
+        Attach a repository database to a session as r{i}.
+        
+        Returns whether it has the trigram symbol index, or None if it could
+        not be attached (unreadable, or not a database).
+        """
+        alias = f"r{i}"
+        try:
+            conn.execute(
+                f"ATTACH DATABASE ? AS {alias}",
+                (f"{db_path.absolute().as_uri()}?mode=ro",)
+            )
+        except sqlite3.Error:
+            return None
+        try:
+            conn.execute(f"PRAGMA {alias}.mmap_size = {self.MMAP_SIZE}")
+            conn.execute(f"PRAGMA {alias}.cache_size = -{self.CACHE_SIZE_KB}")
+            # A file that is not a database attaches, then fails on first read
+            return conn.execute(
+                f"SELECT 1 FROM {alias}.sqlite_master WHERE name = 'symbols_trigram'"
+            ).fetchone() is not None
+        except sqlite3.Error:
+            try:
+                conn.execute(f"DETACH DATABASE {alias}")
+            except sqlite3.Error:
+                pass
+            return None
+    
+    def _session(self, db_paths: Tuple[Path, ...]) -> Tuple[sqlite3.Connection, List[Optional[bool]]]:
+        """
+        Get a pooled connection with the given databases attached as r0, r1, ...
+        
+        Returns the connection and, for each database, whether it has the
+        trigram symbol index, or None if it could not be attached. Those are
+        retried on the next call, so a repaired index is picked up.
+        """
+        with self._conn_lock:
+            session = self._session_cache.get(db_paths)
+            if session is None:
+                conn = sqlite3.connect(
+                    ":memory:",
+                    uri=True,
+                    isolation_level=None,
+                    check_same_thread=False
+                )
+                conn.execute("PRAGMA query_only = 1")
+                has_trigram = [
+                    self._attach(conn, i, db_path)
+                    for i, db_path in enumerate(db_paths)
+                ]
+                session = (conn, has_trigram)
+                self._session_cache[db_paths] = session
+            else:
+                conn, has_trigram = session
+                for i, db_path in enumerate(db_paths):
+                    if has_trigram[i] is None:
+                        has_trigram[i] = self._attach(conn, i, db_path)
+            # A copy, so retries by other threads do not change it under the caller
+            return conn, list(has_trigram)
+    
+    @staticmethod
+    def _symbol_select(i: int, use_trigram: bool) -> str:
+        """SQL selecting symbols matching :pattern from attached database r{i}."""
+        alias = f"r{i}"
+        if use_trigram:
+            # The trigram index finds candidates without scanning symbols;
+            # the LIKE on s.name keeps SQLite's exact LIKE semantics
+            return (
+                f"SELECT :repo{i} AS repo, s.name, s.kind, f.path, s.line_start "
+                f"FROM {alias}.symbols_trigram t "
+                f"JOIN {alias}.symbols s ON s.id = t.rowid "
+                f"JOIN {alias}.files f ON f.id = s.file_id "
+                f"WHERE t.name LIKE :pattern AND s.name LIKE :pattern"
+            )
+        return (
+            f"SELECT :repo{i} AS repo, s.name, s.kind, f.path, s.line_start "
+            f"FROM {alias}.symbols s JOIN {alias}.files f ON f.id = s.file_id "
+            f"WHERE s.name LIKE :pattern"
+        )
+    
+    def _query_repos(
+        self,
+        repos: List[Tuple[RepoConfig, Path]],
+        symbol_name: str
+    ) -> List[Dict[str, Any]]:
+        """Find a symbol in up to ATTACH_LIMIT repositories with one query."""
+        params = {'pattern': f"%{symbol_name}%"}
+        rows: List[Tuple[Any, ...]] = []
+        
+        try:
+            conn, has_trigram = self._session(tuple(db_path for _, db_path in repos))
+        except sqlite3.Error:
+            return []
+        
+        # The trigram tokenizer folds case beyond ASCII and can miss short
+        # non-ASCII patterns, so those scan symbols instead
+        ascii_only = symbol_name.isascii()
+        selects = []
+        for i, (repo, _) in enumerate(repos):
+            if has_trigram[i] is None:
+                # Could not be attached; query the rest
+                continue
+            params[f"repo{i}"] = repo.name
+            selects.append(self._symbol_select(i, has_trigram[i] and ascii_only))
+        if not selects:
+            return []
+        
+        try:
+            rows = conn.execute(" UNION ALL ".join(selects), params).fetchall()
+        except sqlite3.Error:
+            # Some database lacks the expected tables; query the rest
+            # one at a time, skipping the ones that fail
+            rows = []
+            for select in selects:
+                try:
+                    rows.extend(conn.execute(select, params))
+                except sqlite3.Error:
+                    pass
+        
+        return [
+            {'repo': row[0], 'name': row[1], 'kind': row[2], 'file': row[3], 'line': row[4]}
+            for row in rows
+        ]
+    
     def find_symbol_across_repos(self, symbol_name: str) -> List[Dict[str, Any]]:
         """Find a symbol across all repositories."""
         results = []
         
-        if self.config is None:
+        repos = self._indexed_repos()
+        if not repos:
             return results
         
-        for repo in self.config.repos:
-            if not repo.enabled:
-                continue
-            
-            repo_path = Path(repo.path)
-            db_path = repo_path / ".pui" / "index.sqlite"
-            
-            if not db_path.exists():
-                continue
-            
-            try:
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute(
-                    "SELECT name, kind, file_path, line_start FROM symbols WHERE name LIKE ?",
-                    (f"%{symbol_name}%",)
-                )
-                
-                for row in cursor.fetchall():
-                    results.append({
-                        'repo': repo.name,
-                        'name': row[0],
-                        'kind': row[1],
-                        'file': row[2],
-                        'line': row[3]
-                    })
-                
-                conn.close()
-            except Exception:
-                pass
+        # Attach repositories in groups, one UNION ALL query per group; the
+        # groups run in parallel and results keep workspace order
+        groups = [
+            repos[i:i + self.ATTACH_LIMIT]
+            for i in range(0, len(repos), self.ATTACH_LIMIT)
+        ]
+        workers = min(self.MAX_QUERY_WORKERS, len(groups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for rows in executor.map(lambda g: self._query_repos(g, symbol_name), groups):
+                results.extend(rows)
         
         return results
 
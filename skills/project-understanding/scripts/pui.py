@@ -15,8 +15,238 @@ Single entrypoint for the Project Understanding Skill with subcommands for:
 """
 
 import argparse
+import atexit
 import sys
-from pathlib import Path
+from functools import lru_cache, wraps
+
+
+# Third-party packages each subcommand needs; commands not listed here
+# (help, bootstrap, find, workspace, ...) run without them
+CMD_DEPS = {
+    "index": ("tree_sitter",),
+    "watch": ("tree_sitter",),
+    "benchmark": ("tree_sitter",),
+}
+
+# Cached outputs kept per command under .pui/cache/
+TREE_CACHE_ENTRIES = 8
+
+
+@lru_cache(maxsize=None)
+def _open_db(db_path: str, readonly: bool = False):
+    """
+    Connected Database for db_path, shared for the rest of the process.
+    
+    Repeated in-process main() calls (e.g. scripted `find` loops) reuse the
+    connection instead of reconnecting and re-running schema setup. Each
+    connection is closed at interpreter exit.
+    
+    Args:
+        db_path: Index database path
+        readonly: Query-only connection; a missing database is still
+            created (empty) by a normal connection
+    """
+    import os
+    from scripts.lib.db import Database
+    
+    readonly = readonly and os.path.exists(db_path)
+    db = Database(db_path).connect(readonly=readonly)
+    atexit.register(db.close)
+    return db
+
+
+@lru_cache(maxsize=1)
+def _json_backend():
+    """
+    Serializer for --format json output, built on first use.
+    
+    Uses orjson when it is installed (a C encoder, much faster on large
+    packs), falling back to one shared json.JSONEncoder(indent=2) when it
+    is not or when orjson rejects a value.
+    """
+    import json
+    
+    encode = json.JSONEncoder(indent=2).encode
+    try:
+        import orjson
+    except ImportError:
+        return encode
+    
+    option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(data) -> str:
+        try:
+            return orjson.dumps(data, option=option).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return encode(data)
+    
+    return dumps
+
+
+def _to_json(data) -> str:
+    """Serialize data as indented JSON."""
+    return _json_backend()(data)
+
+
+def _print_json(data) -> None:
+    """Print data as indented JSON."""
+    sys.stdout.write(_to_json(data))
+    sys.stdout.write("\n")
+
+
+def _print_text(text: str) -> None:
+    """Print a large text block, encoding it once onto the raw stdout buffer."""
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        # stdout replaced by a text-only stream (e.g. StringIO)
+        print(text)
+        return
+    
+    stream.flush()
+    buffer.write(text.encode(stream.encoding or "utf-8", stream.errors or "strict"))
+    buffer.write(b"\n")
+
+
+def _tree_cache_key(repo_root, parts) -> str | None:
+    """
+    Cache key for a command's output at the repository's current commit.
+    
+    Args:
+        repo_root: Repository root (a git worktree)
+        parts: Values the output depends on besides the tree (format, ...)
+    
+    Returns:
+        "<tree-oid>-<digest>", or None when git is unavailable or the
+        worktree differs from HEAD (its output cannot be keyed by the tree)
+    """
+    import hashlib
+    import subprocess
+    from scripts.lib.db import get_db_path
+    
+    try:
+        tree = subprocess.run(
+            ["git", "rev-parse", "HEAD^{tree}"],
+            cwd=repo_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--", ".", ":(exclude).pui"],
+            cwd=repo_root, capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if dirty:
+        return None
+    
+    digest = hashlib.sha1(repr(tuple(parts)).encode())
+    # Packs also read the index, which changes without a new commit
+    db_path = get_db_path(repo_root)
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            st = path.stat()
+        except OSError:
+            digest.update(b"-")
+        else:
+            digest.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+    return f"{tree}-{digest.hexdigest()[:16]}"
+
+
+def _prune_tree_cache(cache_dir) -> None:
+    """Delete all but the TREE_CACHE_ENTRIES most recently used outputs."""
+    entries = []
+    for path in cache_dir.glob("*.txt"):
+        try:
+            entries.append((path.stat().st_mtime_ns, path))
+        except OSError:
+            pass
+    entries.sort(reverse=True)
+    for _, path in entries[TREE_CACHE_ENTRIES:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _cached_by_tree(command: str, key_parts):
+    """
+    Cache a command's stdout under .pui/cache/<command>/, keyed by git tree.
+    
+    Repeated runs at the same commit (CI, editor integrations) replay the
+    stored output instead of regenerating it. A new commit, a dirty worktree
+    or a re-indexed database changes or disables the key. Files ignored by
+    git are not seen by `git status`, so output that reads them (e.g.
+    architecture picking up an ignored local config) may be served stale
+    until the next commit or re-index. Only the TREE_CACHE_ENTRIES most
+    recently used outputs are kept per command.
+    
+    Args:
+        command: Cache subdirectory name
+        key_parts: Function mapping args to the other values output depends on
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(args: argparse.Namespace) -> int:
+            import os
+            
+            if getattr(args, 'output', None):
+                return func(args)
+            key = _tree_cache_key(args.repo_root, (command, *key_parts(args)))
+            if key is None:
+                return func(args)
+            
+            cache_path = args.repo_root / ".pui" / "cache" / command / f"{key}.txt"
+            try:
+                cached = cache_path.read_text(encoding="utf-8")
+            except OSError:
+                pass
+            else:
+                try:
+                    # Mark the entry recently used so pruning keeps it
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                sys.stdout.write(cached)
+                return 0
+            
+            import io
+            from contextlib import redirect_stdout
+            
+            captured = io.StringIO()
+            with redirect_stdout(captured):
+                result = func(args)
+            output = captured.getvalue()
+            sys.stdout.write(output)
+            
+            if result == 0:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                    tmp_path.write_text(output, encoding="utf-8")
+                    os.replace(tmp_path, cache_path)
+                    _prune_tree_cache(cache_path.parent)
+                except OSError:
+                    pass
+            return result
+        return wrapper
+    return decorate
+
+
+def _repomap_key(args: argparse.Namespace) -> tuple:
+    """Values besides the tree that repomap output depends on."""
+    from scripts.lib.budget import resolve_budget
+    
+    # "auto" depends on the model environment, so key on the resolved budget
+    budget = resolve_budget(args.max_tokens, "repomap", config_budget=8000)
+    return (args.format, budget, args.focus, args.depth)
+
+
+@lru_cache(maxsize=1)
+def _skill_root():
+    """Skill installation directory (resolved once per process)."""
+    from pathlib import Path
+    
+    return Path(__file__).resolve().parent.parent
 
 
 def cmd_bootstrap(args: argparse.Namespace) -> int:
@@ -34,16 +264,15 @@ def cmd_index(args: argparse.Namespace) -> int:
     """Builds/updates index database."""
     from scripts.lib.indexer import Indexer
     
-    repo_root = Path.cwd()
-    skill_root = Path(__file__).parent.parent
+    repo_root = args.repo_root
+    skill_root = _skill_root()
     
     with Indexer(repo_root, skill_root) as indexer:
-        # Apply CLI include/exclude patterns
-        if indexer.ignore_manager:
-            for pattern in args.include:
-                indexer.ignore_manager.add_include(pattern)
-            for pattern in args.exclude:
-                indexer.ignore_manager.add_exclude(pattern)
+        # Apply CLI include/exclude patterns (usually there are none)
+        ignore_manager = indexer.ignore_manager
+        if ignore_manager and (args.include or args.exclude):
+            ignore_manager.extend_include(args.include)
+            ignore_manager.extend_exclude(args.exclude)
         
         # Run indexing
         stats = indexer.run(force=getattr(args, 'force', False) or getattr(args, 'index_subcommand', None) == 'build')
@@ -55,23 +284,13 @@ def cmd_index(args: argparse.Namespace) -> int:
     return 0
 
 
-def _resolve_budget_arg(budget_arg: str, pack_type: str, config_budget: int | None = None) -> int:
-    """Resolve budget argument, handling 'auto' value."""
-    if budget_arg == "auto":
-        from scripts.lib.budget import resolve_budget
-        return resolve_budget("auto", pack_type, config_budget)
-    try:
-        return int(budget_arg)
-    except ValueError:
-        return config_budget or 8000
-
-
+@_cached_by_tree("repomap", _repomap_key)
 def cmd_repomap(args: argparse.Namespace) -> int:
     """Prints RepoMapPack (Markdown default)."""
     from scripts.lib.packs import RepoMapPackGenerator
     from scripts.lib.budget import resolve_budget
     
-    repo_root = Path.cwd()
+    repo_root = args.repo_root
     
     # Resolve budget (handles "auto" value)
     budget = resolve_budget(args.max_tokens, "repomap", config_budget=8000)
@@ -84,42 +303,35 @@ def cmd_repomap(args: argparse.Namespace) -> int:
         )
         
         if args.format == "json":
-            import json
-            print(json.dumps({
+            _print_json({
                 'directory_tree': pack.directory_tree,
                 'top_files': pack.top_files,
                 'file_symbols': pack.file_symbols,
                 'dependency_summary': pack.dependency_summary,
-            }, indent=2))
+            })
         else:
-            print(pack.to_text())
+            _print_text(pack.to_text())
     
     return 0
 
 
 def cmd_find(args: argparse.Namespace) -> int:
     """Fuzzy symbol search (JSON default; Markdown option)."""
-    from scripts.lib.db import Database, get_db_path
+    from scripts.lib.db import get_db_path
     
-    repo_root = Path.cwd()
-    db_path = get_db_path(repo_root)
-    db = Database(db_path)
-    db.connect()
+    repo_root = args.repo_root
+    db = _open_db(str(get_db_path(repo_root)), readonly=True)
     
-    try:
-        results = db.search_symbols(args.query, limit=args.limit)
-        
-        if args.format == "json":
-            import json
-            print(json.dumps(results, indent=2))
-        else:
-            print(f"# Search Results for '{args.query}'\n")
-            for i, r in enumerate(results, 1):
-                print(f"{i}. `{r['name']}` ({r['kind']}) in `{r.get('file_path', 'unknown')}:{r.get('line_start', 0)}`")
-        
-        return 0
-    finally:
-        db.close()
+    results = db.search_symbols(args.query, limit=args.limit)
+    
+    if args.format == "json":
+        _print_json(results)
+    else:
+        print(f"# Search Results for '{args.query}'\n")
+        for i, r in enumerate(results, 1):
+            print(f"{i}. `{r['name']}` ({r['kind']}) in `{r.get('file_path', 'unknown')}:{r.get('line_start', 0)}`")
+    
+    return 0
 
 
 def cmd_zoom(args: argparse.Namespace) -> int:
@@ -127,7 +339,7 @@ def cmd_zoom(args: argparse.Namespace) -> int:
     from scripts.lib.packs import ZoomPackGenerator
     from scripts.lib.budget import resolve_budget
     
-    repo_root = Path.cwd()
+    repo_root = args.repo_root
     
     # Resolve budget (handles "auto" value)
     budget = resolve_budget(args.max_tokens, "zoom", config_budget=4000)
@@ -140,16 +352,15 @@ def cmd_zoom(args: argparse.Namespace) -> int:
             return 1
         
         if args.format == "json":
-            import json
-            print(json.dumps({
+            _print_json({
                 'target_symbol': pack.target_symbol,
                 'signature': pack.signature,
                 'docstring': pack.docstring,
                 'callers': pack.callers,
                 'callees': pack.callees,
-            }, indent=2))
+            })
         else:
-            print(pack.to_text())
+            _print_text(pack.to_text())
     
     return 0
 
@@ -159,48 +370,57 @@ def cmd_impact(args: argparse.Namespace) -> int:
     from scripts.lib.packs import ImpactPackGenerator
     from scripts.lib.budget import resolve_budget
     from scripts.lib.impact import GitDiffParser
+    import os
     
-    repo_root = Path.cwd()
+    repo_root = args.repo_root
     
     # Resolve budget (handles "auto" value)
     budget = resolve_budget(args.max_tokens, "impact", config_budget=6000)
     
     # Collect targets from various sources
     targets = []
-    if hasattr(args, 'git_diff') and args.git_diff:
+    git_diff = getattr(args, 'git_diff', None)
+    files = getattr(args, 'files', None)
+    if git_diff:
         try:
             parser = GitDiffParser(repo_root)
             repo_root = parser.repo_root
-            changed_files = parser.get_changed_files(args.git_diff)
+            changed_files = parser.get_changed_files(git_diff)
         except RuntimeError as exc:
-            print(f"Git diff failed for {args.git_diff}: {exc}", file=sys.stderr)
+            print(f"Git diff failed for {git_diff}: {exc}", file=sys.stderr)
             return 1
         targets = [str(path.relative_to(repo_root)) for path in changed_files]
-    elif hasattr(args, 'files') and args.files:
-        # Normalize files to repo-root-relative paths
+    elif files:
+        # Normalize files to repo-root-relative paths with string operations
+        # (no per-file realpath; repo_root is already the resolved cwd)
+        repo_str = str(repo_root)
+        outside = os.pardir + os.sep
         targets = []
-        for f in args.files:
-            p = Path(f).resolve()
+        for f in files:
             try:
-                targets.append(str(p.relative_to(repo_root)))
+                rel = os.path.relpath(os.path.abspath(f), repo_str)
             except ValueError:
+                # Different drive on Windows
+                rel = outside
+            if rel == os.pardir or rel.startswith(outside):
                 # Fallback for files outside repo root
                 targets.append(f)
+            else:
+                targets.append(rel)
     
     with ImpactPackGenerator(repo_root) as gen:
         pack = gen.generate(targets, budget_tokens=budget)
         
         if args.format == "json":
-            import json
-            print(json.dumps({
+            _print_json({
                 'changed_items': pack.changed_items,
                 'affected_files': pack.affected_files,
                 'affected_tests': pack.affected_tests,
                 'affected_symbols': pack.affected_symbols,
                 'ranked_inspection': pack.ranked_inspection,
-            }, indent=2))
+            })
         else:
-            print(pack.to_text())
+            _print_text(pack.to_text())
     
     return 0
 
@@ -208,49 +428,38 @@ def cmd_impact(args: argparse.Namespace) -> int:
 def cmd_graph(args: argparse.Namespace) -> int:
     """Exports dependency graph in Mermaid or DOT format."""
     from scripts.lib.graph_export import GraphExporter
-    from scripts.lib.db import Database, get_db_path
+    from scripts.lib.db import get_db_path
     
-    repo_root = Path.cwd()
-    db_path = get_db_path(repo_root)
-    db = Database(db_path)
-    db.connect()
+    # Numeric IDs are used as-is; only names need a database lookup
+    symbol_id = args.symbol
+    if isinstance(symbol_id, str) and symbol_id.isdecimal():
+        symbol_id = int(symbol_id)
     
-    try:
-        # Ensure connection is established
-        if db._conn is None:
-            print("Database connection failed", file=sys.stderr)
+    repo_root = args.repo_root
+    db = _open_db(str(get_db_path(repo_root)), readonly=True)
+    
+    # Ensure connection is established
+    if db._conn is None:
+        print("Database connection failed", file=sys.stderr)
+        return 1
+    
+    if isinstance(symbol_id, str):
+        # Try to find by name
+        symbol_id = db.resolve_symbol_id(symbol_id)
+        if symbol_id is None:
+            print(f"Symbol not found: {args.symbol}", file=sys.stderr)
             return 1
-        
-        # Resolve symbol
-        symbol_id = args.symbol
-        if isinstance(symbol_id, str):
-            try:
-                symbol_id = int(symbol_id)
-            except ValueError:
-                # Try to find by name
-                cursor = db._conn.execute(
-                    "SELECT id FROM symbols WHERE name = ? LIMIT 1",
-                    (symbol_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    symbol_id = row[0]
-                else:
-                    print(f"Symbol not found: {args.symbol}", file=sys.stderr)
-                    return 1
-        
-        exporter = GraphExporter(db)
-        result = exporter.generate_graph_pack(
-            symbol_id=symbol_id,
-            depth=args.depth,
-            format=args.format,
-            title=args.title if hasattr(args, 'title') else None
-        )
-        
-        print(result)
-        return 0
-    finally:
-        db.close()
+    
+    exporter = GraphExporter(db)
+    result = exporter.generate_graph_pack(
+        symbol_id=symbol_id,
+        depth=args.depth,
+        format=args.format,
+        title=getattr(args, 'title', None)
+    )
+    
+    print(result)
+    return 0
 
 
 def cmd_watch(args: argparse.Namespace) -> int:
@@ -261,11 +470,13 @@ def cmd_watch(args: argparse.Namespace) -> int:
     # Install signal handlers for clean shutdown
     install_signal_handlers()
     
-    repo_root = Path.cwd()
-    skill_root = Path(__file__).parent.parent
+    repo_root = args.repo_root
+    skill_root = _skill_root()
+    
+    verbose = getattr(args, 'verbose', False)
     
     # Print platform info
-    if hasattr(args, 'verbose') and args.verbose:
+    if verbose:
         platform = PlatformSupport()
         platform.print_report()
         print()
@@ -274,7 +485,7 @@ def cmd_watch(args: argparse.Namespace) -> int:
         repo_root=repo_root,
         skill_root=skill_root,
         debounce_seconds=args.debounce,
-        verbose=getattr(args, 'verbose', False)
+        verbose=verbose
     )
     
     try:
@@ -285,11 +496,13 @@ def cmd_watch(args: argparse.Namespace) -> int:
     return 0
 
 
+@_cached_by_tree("depgraph", lambda args: (args.format, args.scope, args.verbose))
 def cmd_depgraph(args: argparse.Namespace) -> int:
     """Generate module dependency graph."""
     from scripts.lib.modules import ModuleDependencyAnalyzer
+    from pathlib import Path
     
-    repo_root = Path.cwd()
+    repo_root = args.repo_root
     analyzer = ModuleDependencyAnalyzer(repo_root, verbose=args.verbose)
     
     modules, edges = analyzer.analyze()
@@ -299,14 +512,13 @@ def cmd_depgraph(args: argparse.Namespace) -> int:
     elif args.format == "dot":
         output = analyzer.to_dot(scope=args.scope)
     else:  # json
-        import json
-        output = json.dumps(analyzer.get_dependency_graph(), indent=2)
+        output = _to_json(analyzer.get_dependency_graph())
     
     if args.output:
-        Path(args.output).write_text(output)
+        Path(args.output).write_bytes(output.encode("utf-8"))
         print(f"Dependency graph written to {args.output}")
     else:
-        print(output)
+        _print_text(output)
     
     return 0
 
@@ -314,123 +526,111 @@ def cmd_depgraph(args: argparse.Namespace) -> int:
 def cmd_benchmark(args: argparse.Namespace) -> int:
     """Run performance benchmarks."""
     from scripts.lib.benchmark import run_benchmark_command
+    from pathlib import Path
     
     output_file = Path(args.output) if args.output else None
     return run_benchmark_command(output_format=args.format, output_file=output_file)
 
 
 
+@_cached_by_tree("architecture", lambda args: (args.format,))
 def cmd_architecture(args: argparse.Namespace) -> int:
     """Analyze repository architecture."""
     from scripts.lib.architecture import analyze_architecture
-    from scripts.lib.db import Database, get_db_path
+    from scripts.lib.db import get_db_path
     
-    repo_root = Path.cwd()
-    db_path = get_db_path(repo_root)
-    db = Database(db_path)
-    db.connect()
+    repo_root = args.repo_root
+    db = _open_db(str(get_db_path(repo_root)))
     
-    try:
-        # Get detected languages from index
-        languages = []
-        cursor = db._conn.execute("SELECT DISTINCT lang FROM files")
-        languages = [row[0] for row in cursor.fetchall()]
-        
-        # Load files from repository for analysis
-        files_content = {}
-        for ext in ["*.py", "*.js", "*.ts", "*.go", "*.rs", "*.cpp", "*.h", "*.hpp", "*.cc", "*.cxx", "*.c"]:
-            for file_path in repo_root.rglob(ext):
-                try:
-                    rel_path = str(file_path.relative_to(repo_root))
-                    files_content[rel_path] = file_path.read_text()
-                except Exception:
-                    pass
-        
-        pack = analyze_architecture(repo_root, files_content, languages)
-        
-        if args.format == "json":
-            import json
-            print(json.dumps(pack.to_dict(), indent=2))
-        else:
-            print(pack.to_text())
-        
-        return 0
-    finally:
-        db.close()
+    # Get detected languages from index
+    languages = []
+    cursor = db._conn.execute("SELECT DISTINCT lang FROM files")
+    languages = [row[0] for row in cursor.fetchall()]
+    
+    # Files are streamed from the repository during analysis
+    pack = analyze_architecture(repo_root, languages=languages)
+    
+    if args.format == "json":
+        _print_json(pack.to_dict())
+    else:
+        _print_text(pack.to_text())
+    
+    return 0
 
 
-def cmd_workspace(args: argparse.Namespace) -> int:
-    """Manage multi-repository workspaces."""
-    from scripts.lib.workspace import WorkspaceManager, init_workspace
-    from pathlib import Path
+@lru_cache(maxsize=None)
+def _workspace_manager(config_path: str):
+    """
+    WorkspaceManager for config_path, shared for the rest of the process.
     
-    if args.workspace_command == "init":
-        repo_paths = [Path(p) for p in args.repos]
-        config = init_workspace(args.name, repo_paths)
-        print(f"Created workspace '{args.name}' with {len(config.repos)} repositories")
-        return 0
+    Repeated in-process workspace commands reuse the parsed configuration
+    and pooled connections. The manager is closed at interpreter exit.
+    """
+    from scripts.lib.workspace import WorkspaceManager
+    from pathlib import Path
     
-    elif args.workspace_command == "graph":
-        manager = WorkspaceManager(Path(".pui-workspace.json"))
-        if not manager.config:
-            print("No workspace configured. Run 'pui workspace init' first.")
-            return 1
-        
-        graph = manager.build_unified_graph()
-        print(graph.to_text())
-        return 0
-    
-    elif args.workspace_command == "find":
-        manager = WorkspaceManager(Path(".pui-workspace.json"))
-        if not manager.config:
-            print("No workspace configured. Run 'pui workspace init' first.")
-            return 1
-        
-        results = manager.find_symbol_across_repos(args.symbol)
-        if results:
-            print(f"Found '{args.symbol}' in {len(results)} locations:")
-            for r in results:
-                print(f"  {r['repo']}: {r['name']} ({r['kind']}) in {r['file']}:{r['line']}")
-        else:
-            print(f"Symbol '{args.symbol}' not found in workspace")
-        return 0
+    manager = WorkspaceManager(Path(config_path))
+    atexit.register(manager.close)
+    return manager
+
+
+def _ws_init(args: argparse.Namespace) -> int:
+    """Create a workspace from the given repositories."""
+    from scripts.lib.workspace import init_workspace
+    from pathlib import Path
     
+    repo_paths = [Path(p) for p in args.repos]
+    config = init_workspace(args.name, repo_paths)
+    # Managers loaded earlier in this process hold the old configuration
+    _workspace_manager.cache_clear()
+    print(f"Created workspace '{args.name}' with {len(config.repos)} repositories")
     return 0
 
-def main(argv: list[str] | None = None) -> int:
-    """Main entrypoint for the PUI CLI."""
-    # Pre-flight check for dependencies
-    try:
-        import tree_sitter  # noqa: F401
-    except ImportError as e:
-        print(f"Error: Missing dependency '{e.name}'.", file=sys.stderr)
-        print("Please run the bootstrap script first:", file=sys.stderr)
-        print(f"  {sys.executable} {Path(__file__).parent}/bootstrap.py", file=sys.stderr)
-        print("\nOr use the provided shim:", file=sys.stderr)
-        print(f"  {Path(__file__).parent}/pui.sh", file=sys.stderr)
-        return 1
 
-    parser = argparse.ArgumentParser(
-        prog="pui",
-        description="Project Understanding Interface - analyze and navigate codebases",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  pui bootstrap              # Set up local runtime dependencies
-  pui index                  # Build/update index database
-  pui watch                  # Watch files and auto-update index
-  pui repomap                # Print RepoMapPack (Markdown)
-  pui repomap --max-tokens auto  # Auto-detect token budget for model
-  pui find "auth*"           # Fuzzy search for symbols matching "auth*"
-  pui zoom src/auth.py       # Print ZoomPack for file
-  pui graph -s auth_login -d 2 --format mermaid  # Export dependency graph
-  pui depgraph --format mermaid       # Generate module dependency graph
-        """
-    )
+def _ws_graph(args: argparse.Namespace) -> int:
+    """Print the unified cross-repository graph."""
+    manager = _workspace_manager(str(args.repo_root / ".pui-workspace.json"))
+    if not manager.config:
+        print("No workspace configured. Run 'pui workspace init' first.")
+        return 1
     
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    graph = manager.build_unified_graph()
+    print(graph.to_text())
+    return 0
+
+
+def _ws_find(args: argparse.Namespace) -> int:
+    """Find a symbol across the workspace repositories."""
+    manager = _workspace_manager(str(args.repo_root / ".pui-workspace.json"))
+    if not manager.config:
+        print("No workspace configured. Run 'pui workspace init' first.")
+        return 1
     
-    # bootstrap subcommand
+    results = manager.find_symbol_across_repos(args.symbol)
+    if results:
+        print(f"Found '{args.symbol}' in {len(results)} locations:")
+        for r in results:
+            print(f"  {r['repo']}: {r['name']} ({r['kind']}) in {r['file']}:{r['line']}")
+    else:
+        print(f"Symbol '{args.symbol}' not found in workspace")
+    return 0
+
+
+_WORKSPACE_COMMANDS = {
+    "init": _ws_init,
+    "graph": _ws_graph,
+    "find": _ws_find,
+}
+
+
+def cmd_workspace(args: argparse.Namespace) -> int:
+    """Manage multi-repository workspaces."""
+    handler = _WORKSPACE_COMMANDS.get(args.workspace_command)
+    return handler(args) if handler else 0
+
+
+def _add_bootstrap_parser(subparsers) -> None:
+    """Register the bootstrap subcommand."""
     bootstrap_parser = subparsers.add_parser(
         "bootstrap",
         help="Set up local runtime dependencies"
@@ -441,8 +641,10 @@ Examples:
         help="Skip network operations, use pre-downloaded packages only"
     )
     bootstrap_parser.set_defaults(func=cmd_bootstrap)
-    
-    # index subcommand
+
+
+def _add_index_parser(subparsers) -> None:
+    """Register the index subcommand."""
     index_parser = subparsers.add_parser(
         "index",
         help="Build/update index database"
@@ -476,8 +678,9 @@ Examples:
         )
     index_parser.set_defaults(func=cmd_index)
 
-    
-    # repomap subcommand
+
+def _add_repomap_parser(subparsers) -> None:
+    """Register the repomap subcommand."""
     repomap_parser = subparsers.add_parser(
         "repomap",
         help="Print RepoMapPack (Markdown default)"
@@ -505,8 +708,10 @@ Examples:
         help="Directory tree depth (default: 2)"
     )
     repomap_parser.set_defaults(func=cmd_repomap)
-    
-    # find subcommand
+
+
+def _add_find_parser(subparsers) -> None:
+    """Register the find subcommand."""
     find_parser = subparsers.add_parser(
         "find",
         help="Fuzzy symbol search (JSON default; Markdown option)"
@@ -528,8 +733,10 @@ Examples:
         help="Maximum results (default: 50)"
     )
     find_parser.set_defaults(func=cmd_find)
-    
-    # zoom subcommand
+
+
+def _add_zoom_parser(subparsers) -> None:
+    """Register the zoom subcommand."""
     zoom_parser = subparsers.add_parser(
         "zoom",
         help="Print ZoomPack for a file/symbol",
@@ -566,8 +773,10 @@ Examples:
         help="Lines of context around references (default: 10)"
     )
     zoom_parser.set_defaults(func=cmd_zoom)
-    
-    # impact subcommand
+
+
+def _add_impact_parser(subparsers) -> None:
+    """Register the impact subcommand."""
     impact_parser = subparsers.add_parser(
         "impact",
         help="Print ImpactPack for a changed set"
@@ -600,8 +809,10 @@ Examples:
         help="Include test impact analysis"
     )
     impact_parser.set_defaults(func=cmd_impact)
-    
-    # graph subcommand
+
+
+def _add_graph_parser(subparsers) -> None:
+    """Register the graph subcommand."""
     graph_parser = subparsers.add_parser(
         "graph",
         help="Export dependency graph (Mermaid/DOT)"
@@ -624,8 +835,10 @@ Examples:
         help="Output format (default: mermaid)"
     )
     graph_parser.set_defaults(func=cmd_graph)
-    
-    # watch subcommand
+
+
+def _add_watch_parser(subparsers) -> None:
+    """Register the watch subcommand."""
     watch_parser = subparsers.add_parser(
         "watch",
         help="Watch files and auto-update index"
@@ -637,8 +850,10 @@ Examples:
         help="Debounce delay in seconds (default: 1.0)"
     )
     watch_parser.set_defaults(func=cmd_watch)
-    
-    # depgraph subcommand
+
+
+def _add_depgraph_parser(subparsers) -> None:
+    """Register the depgraph subcommand."""
     depgraph_parser = subparsers.add_parser(
         "depgraph",
         help="Generate module dependency graph"
@@ -665,8 +880,10 @@ Examples:
         help="Enable verbose logging"
     )
     depgraph_parser.set_defaults(func=cmd_depgraph)
-    
-    # benchmark subcommand
+
+
+def _add_benchmark_parser(subparsers) -> None:
+    """Register the benchmark subcommand."""
     benchmark_parser = subparsers.add_parser(
         "benchmark",
         help="Run performance benchmarks"
@@ -682,8 +899,10 @@ Examples:
         help="Output file (default: stdout)"
     )
     benchmark_parser.set_defaults(func=cmd_benchmark)
-    
-    # architecture subcommand
+
+
+def _add_architecture_parser(subparsers) -> None:
+    """Register the architecture subcommand."""
     arch_parser = subparsers.add_parser(
         "architecture",
         help="Analyze repository architecture and frameworks"
@@ -695,8 +914,10 @@ Examples:
         help="Output format (default: markdown)"
     )
     arch_parser.set_defaults(func=cmd_architecture)
-    
-    # workspace subcommand
+
+
+def _add_workspace_parser(subparsers) -> None:
+    """Register the workspace subcommand."""
     workspace_parser = subparsers.add_parser(
         "workspace",
         help="Manage multi-repository workspaces"
@@ -738,13 +959,108 @@ Examples:
     )
     
     workspace_parser.set_defaults(func=cmd_workspace)
+
+
+_SUBPARSER_BUILDERS = {
+    "bootstrap": _add_bootstrap_parser,
+    "index": _add_index_parser,
+    "repomap": _add_repomap_parser,
+    "find": _add_find_parser,
+    "zoom": _add_zoom_parser,
+    "impact": _add_impact_parser,
+    "graph": _add_graph_parser,
+    "watch": _add_watch_parser,
+    "depgraph": _add_depgraph_parser,
+    "benchmark": _add_benchmark_parser,
+    "architecture": _add_architecture_parser,
+    "workspace": _add_workspace_parser,
+}
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    """Subcommand named by argv's first token, or None if it isn't one."""
+    if argv and argv[0] in _SUBPARSER_BUILDERS:
+        return argv[0]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser.
+    
+    With a command, only that subcommand's parser is added; without one
+    (top-level help, unknown commands) every subcommand is. Each variant is
+    built once per process and shared by repeated main() calls, since
+    parsing doesn't modify it. Call _build_parser.cache_clear() after
+    registering subcommands at runtime (nothing does today).
     
+    Args:
+        command: Subcommand from _sniff_subcommand(), or None
+    """
+    parser = argparse.ArgumentParser(
+        prog="pui",
+        description="Project Understanding Interface - analyze and navigate codebases",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  pui bootstrap              # Set up local runtime dependencies
+  pui index                  # Build/update index database
+  pui watch                  # Watch files and auto-update index
+  pui repomap                # Print RepoMapPack (Markdown)
+  pui repomap --max-tokens auto  # Auto-detect token budget for model
+  pui find "auth*"           # Fuzzy search for symbols matching "auth*"
+  pui zoom src/auth.py       # Print ZoomPack for file
+  pui graph -s auth_login -d 2 --format mermaid  # Export dependency graph
+  pui depgraph --format mermaid       # Generate module dependency graph
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    if command is not None:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for add_parser in _SUBPARSER_BUILDERS.values():
+            add_parser(subparsers)
+    
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entrypoint for the PUI CLI."""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Only the invoked subcommand's parser is built
+    parser = _build_parser(_sniff_subcommand(argv))
     args = parser.parse_args(argv)
     
     if args.command is None:
         parser.print_help()
         return 1
     
+    # Pre-flight check for the command's dependencies; find_spec locates a
+    # package without paying for its import (or importlib.util's, when the
+    # command has none)
+    deps = CMD_DEPS.get(args.command, ())
+    missing = []
+    if deps:
+        import importlib.util
+        missing = [name for name in deps if importlib.util.find_spec(name) is None]
+    from pathlib import Path
+    
+    if missing:
+        print(f"Error: Missing dependency '{missing[0]}'.", file=sys.stderr)
+        print("Please run the bootstrap script first:", file=sys.stderr)
+        print(f"  {sys.executable} {Path(__file__).parent}/bootstrap.py", file=sys.stderr)
+        print("\nOr use the provided shim:", file=sys.stderr)
+        print(f"  {Path(__file__).parent}/pui.sh", file=sys.stderr)
+        return 1
+    
+    # Read the working directory once; commands use args.repo_root
+    args.repo_root = Path.cwd()
+    
     return args.func(args)
 
 
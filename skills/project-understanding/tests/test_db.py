@@ -11,6 +11,7 @@ Tests cover:
 """
 
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -79,6 +80,28 @@ class TestDatabaseInitialization:
             assert enabled == 1
             
             db.close()
+    
+    def test_readonly_connection(self):
+        """Read-only connections should see committed rows and refuse writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "test.db"
+            writer = Database(db_path)
+            writer.connect()
+            file_id = writer.add_file("src/main.py", 1, 100, "hash1")
+            writer.add_symbol(file_id, "authenticate", "function", 1)
+            writer.commit()
+            
+            # The writer stays open, so its rows are still only in the WAL
+            reader = Database(db_path)
+            reader.connect(readonly=True)
+            
+            assert [r['name'] for r in reader.search_symbols("auth*")] == ["authenticate"]
+            assert [r['name'] for r in reader.search_symbols("*cate")] == ["authenticate"]
+            with pytest.raises(sqlite3.OperationalError):
+                reader.add_file("src/other.py", 1, 100, "hash2")
+            
+            reader.close()
+            writer.close()
 
 
 class TestFileOperations:
@@ -234,6 +257,19 @@ class TestSymbolOperations:
         assert isinstance(symbol_id, int)
         assert symbol_id > 0
     
+    def test_resolve_symbol_id(self, db_with_file):
+        """Resolving a symbol name should return its ID or None."""
+        db, file_id = db_with_file
+        
+        symbol_id = db.add_symbol(file_id, "func1", "function", 1)
+        
+        assert db.resolve_symbol_id("func1") == symbol_id
+        assert db.resolve_symbol_id("missing") is None
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM symbols WHERE name = ? LIMIT 1", ("func1",)
+        ).fetchall()
+        assert any("idx_symbols_name" in row[3] for row in plan)
+    
     def test_get_symbols_in_file(self, db_with_file):
         """Getting symbols in file should return list."""
         db, file_id = db_with_file
@@ -279,6 +315,53 @@ class TestSymbolOperations:
         names = {r['name'] for r in results}
         assert "authenticate" in names
         assert "authorization" in names
+    
+    def test_search_symbols_glob(self, db_with_file):
+        """Wildcards FTS cannot express should match as a glob."""
+        db, file_id = db_with_file
+        
+        db.add_symbol(file_id, "get_user", "function", 1)
+        db.add_symbol(file_id, "set_user", "function", 10)
+        db.add_symbol(file_id, "get_users", "function", 20)
+        db.commit()
+        
+        assert {r['name'] for r in db.search_symbols("?et_user")} == {"get_user", "set_user"}
+        assert {r['name'] for r in db.search_symbols("*_USERS")} == {"get_users"}
+        assert len(db.search_symbols("*user*", limit=2)) == 2
+    
+    def test_trigram_index_tracks_symbols(self, db_with_file):
+        """The trigram index should answer substring searches as symbols change."""
+        db, file_id = db_with_file
+        
+        keep = db.add_symbol(file_id, "parse_header", "function", 1)
+        gone = db.add_symbol(file_id, "HeaderCache", "class", 10)
+        db.add_symbol(file_id, "login", "function", 20)
+        db.conn.execute("DELETE FROM symbols WHERE id = ?", (gone,))
+        db.conn.execute("UPDATE symbols SET name = 'read_header' WHERE id = ?", (keep,))
+        db.commit()
+        
+        rows = db.conn.execute(
+            "SELECT s.name FROM symbols_trigram t JOIN symbols s ON s.id = t.rowid "
+            "WHERE t.name LIKE ?",
+            ("%header%",)
+        ).fetchall()
+        
+        assert [row[0] for row in rows] == ["read_header"]
+    
+    def test_fts_index_rebuilt_when_missing(self, db_with_file):
+        """Reconnecting to an index without symbols_fts should backfill it."""
+        db, file_id = db_with_file
+        
+        db.add_symbol(file_id, "authenticate", "function", 1)
+        db.commit()
+        db.conn.executescript(
+            "DROP TRIGGER symbols_ai; DROP TRIGGER symbols_ad; "
+            "DROP TRIGGER symbols_au; DROP TABLE symbols_fts;"
+        )
+        db.close()
+        db.connect()
+        
+        assert [r['name'] for r in db.search_symbols("auth*")] == ["authenticate"]
 
 
 class TestEdgeOperations:
@@ -340,6 +423,22 @@ class TestEdgeOperations:
         
         assert len(edges) == 1
         assert edges[0]['source_id'] == source_id
+    
+    def test_prefetch_subgraph(self, db_with_symbols):
+        """Prefetched edges should match per-symbol lookups within depth."""
+        db, file_id, source_id, target_id = db_with_symbols
+        
+        leaf_id = db.add_symbol(file_id, "leaf", "function", 20)
+        db.add_edge(source_id, target_id, "call", file_id)
+        db.add_edge(target_id, leaf_id, "call", file_id)
+        
+        symbols, outgoing, incoming = db.prefetch_subgraph(source_id, depth=1)
+        
+        assert set(outgoing) == {source_id, target_id}
+        assert set(incoming) == {source_id}
+        assert outgoing[target_id] == db.get_outgoing_edges(target_id)
+        assert leaf_id not in symbols
+        assert symbols[target_id]['file_path'] == "src/main.py"
 
 
 class TestTransactionBatching:
@@ -444,6 +543,19 @@ class TestMetadata:
         assert stats['files'] == 2
         assert stats['symbols'] == 1
         assert stats['schema_version'] > 0
+    
+    def test_row_counts_follow_cascading_deletes(self, db):
+        """Maintained row counts should match the tables after cascades."""
+        file_a = db.add_file("a.py", 1, 100, "hash1")
+        file_b = db.add_file("b.py", 2, 100, "hash2")
+        caller = db.add_symbol(file_a, "caller", "function", 1)
+        callee = db.add_symbol(file_b, "callee", "function", 1)
+        db.add_edge(caller, callee, "call", file_a)
+        db.add_file("a.py", 3, 120, "hash3")  # Update, not a new row
+        db.delete_file("b.py")
+        db.commit()
+        
+        assert db.get_row_counts() == {'files': 1, 'symbols': 1, 'edges': 0}
 
 
 class TestUtilityFunctions:
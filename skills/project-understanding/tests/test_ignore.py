@@ -155,6 +155,16 @@ class TestIgnoreManagerMatching:
         
         # Include has higher priority
         assert manager.should_ignore("test.py") is False
+    
+    def test_extend_include_and_exclude(self, manager):
+        """Batch-added patterns should behave like individually added ones."""
+        manager.extend_exclude(["secret.py", "*.key"])
+        manager.extend_include(["important.pyc"])
+        
+        assert manager.should_ignore("secret.py") is True
+        assert manager.should_ignore("prod.key") is True
+        assert manager.should_ignore("important.pyc") is False
+        assert [p.source for p in manager.exclude_patterns] == ["cli-exclude"] * 2
 
 
 class TestFileDiscovery:
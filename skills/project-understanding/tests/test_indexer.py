@@ -461,6 +461,36 @@ class TestRunIndexing:
                 stats2 = indexer2.run()
             
             assert stats2.files_unchanged == 1
+    
+    def test_run_parses_languages_in_parallel(self, monkeypatch):
+        """Files of different languages should be parsed on worker threads."""
+        import scripts.lib.indexer as indexer_module
+        
+        monkeypatch.setattr(indexer_module.os, "cpu_count", lambda: 4)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir) / "repo"
+            skill = Path(tmpdir) / "skill"
+            repo.mkdir()
+            skill.mkdir()
+            
+            (repo / "main.py").write_text("def main():\n    pass\n")
+            (repo / "app.js").write_text("function app() {}\n")
+            (repo / "lib.go").write_text("package lib\n\nfunc Lib() {}\n")
+            
+            assets_dir = skill / "assets"
+            assets_dir.mkdir()
+            (assets_dir / "default-ignore.txt").write_text("")
+            
+            with Indexer(repo, skill, verbose=False) as indexer:
+                stats = indexer.run()
+                
+                assert stats.files_new == 3
+                assert len(indexer.timings["prefetch_parses"]) == 1
+                assert indexer._parsed == {}
+                for path in ("main.py", "app.js", "lib.go"):
+                    file_id = indexer.db.get_file(path)["id"]
+                    assert indexer.db.get_symbols_in_file(file_id)
 
 
 class TestTiming:
@@ -0,0 +1,39 @@
+"""
+Unit tests for the LSP provider.
+
+Tests cover:
+- Incremental didChange ranges
+"""
+
+from scripts.lib.providers.lsp import _incremental_change
+
+
+class TestIncrementalChange:
+    """Tests for building incremental didChange patches."""
+    
+    def test_changed_line_range(self):
+        """Only the edited lines should be sent."""
+        change = _incremental_change("a\nb\nc\n", "a\nB\nc\n")
+        
+        assert change == {
+            "range": {"start": {"line": 1, "character": 0}, "end": {"line": 2, "character": 0}},
+            "text": "B\n",
+        }
+    
+    def test_non_lsp_line_breaks_stay_inside_lines(self):
+        """Form feeds and Unicode separators should not count as line breaks."""
+        old = "a\x0cb\nx\u2028y\nc\n"
+        new = "a\x0cb\nx\u2028y\nC\n"
+        
+        change = _incremental_change(old, new)
+        
+        assert change["range"]["start"] == {"line": 2, "character": 0}
+        assert change["range"]["end"] == {"line": 3, "character": 0}
+        assert change["text"] == "C\n"
+    
+    def test_end_of_unterminated_last_line(self):
+        """The end of a last line without a newline should be its UTF-16 length."""
+        change = _incremental_change("a\nb\x0c", "a\nz")
+        
+        assert change["range"]["end"] == {"line": 1, "character": 2}
+        assert change["text"] == "z"
@@ -16,11 +16,12 @@ from pathlib import Path
 try:
     from scripts.lib.parser import (
         TreeSitterParser, LanguageSupport, Symbol, Import, Callsite, ParseResult,
-        parse_file
+        parse_file, HAS_LANGUAGE_BINDINGS
     )
     TREE_SITTER_AVAILABLE = True
 except ImportError:
     TREE_SITTER_AVAILABLE = False
+    HAS_LANGUAGE_BINDINGS = False
 
 
 # Skip all tests if tree-sitter is not available
@@ -456,7 +457,24 @@ class TestIntegration:
             
             assert result is not None
             assert result.language == "python"
-    
+
+    def test_parse_file_reuses_default_parser(self):
+        """Convenience function should share one parser across calls."""
+        from scripts.lib import parser as parser_module
+
+        assert parser_module._get_default_parser() is parser_module._get_default_parser()
+
+    @pytest.mark.skipif(not HAS_LANGUAGE_BINDINGS, reason="language bindings not installed")
+    def test_queries_shared_across_instances(self):
+        """Compiled queries should be cached per process, not per instance."""
+        first = LanguageSupport()
+        second = LanguageSupport()
+        
+        query = first._load_query('python', 'symbols')
+        
+        assert query is not None
+        assert query is second._load_query('python', 'calls')
+
     def test_parse_with_content(self):
         """Should parse provided content."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,338 @@
+"""
+Unit tests for the SCIP provider.
+
+Tests cover:
+- Protobuf wire-format decoding
+- Choosing the JSON or binary decoder from the index content
+- Definitions, references, call hierarchy and statistics from an index
+"""
+
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from scripts.lib.providers.base import Position
+from scripts.lib.providers.scip import SCIPIterator, SCIPProvider, _decode_index
+
+
+# Two documents: foo is referenced from both, bar is referenced by foo's
+# relationship, and ext/missing(). occurs without any symbol definition
+JSON_INDEX = {
+    "metadata": {"version": 1, "project_root": "file:///repo"},
+    "documents": [
+        {
+            "relative_path": "pkg/a.py",
+            "language": "python",
+            "occurrences": [
+                {"range": [0, 4, 7], "symbol": "pkg/foo().", "symbol_roles": 1},
+                {"range": [3, 4, 7], "symbol": "pkg/bar().", "symbol_roles": 1},
+                {"range": [1, 4, 7], "symbol": "pkg/bar()."},
+                {"range": [1, 10, 13], "symbol": "ext/missing()."},
+                {"range": [5, 0, 3], "symbol": "pkg/foo()."},
+            ],
+            "symbols": [
+                {
+                    "symbol": "pkg/foo().",
+                    "kind": "Function",
+                    "documentation": ["Does foo."],
+                    "relationships": [{"symbol": "pkg/bar().", "is_reference": True}],
+                },
+                {"symbol": "pkg/bar().", "kind": "Function", "display_name": "bar"},
+            ],
+        },
+        {
+            "relative_path": "pkg/b.py",
+            "language": "python",
+            "occurrences": [
+                {"range": [2, 8, 11], "symbol": "pkg/foo()."},
+                {"range": [0, 6, 12], "symbol": "pkg/Widget#", "symbol_roles": 1},
+            ],
+            "symbols": [
+                {"symbol": "pkg/Widget#", "kind": "Class", "signature": "class Widget"},
+            ],
+        },
+    ],
+}
+
+
+def varint(value):
+    """Encode a protobuf varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def field(number, value):
+    """Encode a field: varint for ints, length-delimited otherwise."""
+    if isinstance(value, int):
+        return varint(number << 3) + varint(value)
+    if isinstance(value, str):
+        value = value.encode()
+    return varint(number << 3 | 2) + varint(len(value)) + value
+
+
+def packed(number, values):
+    """Encode a packed repeated int32 field."""
+    return field(number, b"".join(varint(v) for v in values))
+
+
+def metadata(project_root="file:///repo"):
+    """Encode a Metadata message."""
+    tool_info = field(1, "scip-python") + field(2, "0.3.0") + field(3, "index") + field(3, ".")
+    return field(1, 1) + field(2, tool_info) + field(3, project_root) + field(4, 1)
+
+
+def document():
+    """Encode a Document with a definition, a reference and its symbol."""
+    # One packed and one unpacked range; symbols carry kind and docs
+    definition = packed(1, [0, 4, 7]) + field(2, "pkg/foo().") + field(3, 1)
+    reference = field(1, 3) + field(1, 8) + field(1, 11) + field(2, "pkg/foo().")
+    symbol = (
+        field(1, "pkg/foo().") + field(3, "Does foo.") + field(5, 17)
+        + field(4, field(1, "pkg/Base#") + field(3, 1))
+    )
+    return (
+        field(1, "src/foo.py") + field(2, definition) + field(2, reference)
+        + field(3, symbol) + field(4, "python")
+    )
+
+
+def index(project_root="file:///repo"):
+    """Encode an Index message with one document."""
+    return field(1, metadata(project_root)) + field(2, document())
+
+
+class TestDecodeIndex:
+    """Tests for decoding the SCIP protobuf wire format."""
+    
+    def test_metadata(self):
+        """Metadata fields should decode like the JSON encoding."""
+        meta, documents = _decode_index(index())
+        
+        assert meta == {
+            'version': 1,
+            'tool_info': {'name': 'scip-python', 'version': '0.3.0', 'arguments': ['index', '.']},
+            'project_root': 'file:///repo',
+            'text_document_encoding': 1,
+        }
+        assert len(documents) == 1
+    
+    def test_documents(self):
+        """Documents should keep path, language, occurrences and symbols."""
+        _, documents = _decode_index(index())
+        doc = documents[0]
+        
+        assert doc['relative_path'] == 'src/foo.py'
+        assert doc['language'] == 'python'
+        assert doc['symbols'] == [{
+            'symbol': 'pkg/foo().',
+            'documentation': ['Does foo.'],
+            'kind': 'Function',
+            'relationships': [{'symbol': 'pkg/Base#', 'is_implementation': True}],
+        }]
+        assert [occ['symbol'] for occ in doc['occurrences']] == ['pkg/foo().', 'pkg/foo().']
+        assert doc['occurrences'][0]['symbol_roles'] == 1
+    
+    def test_packed_and_unpacked_ranges(self):
+        """Packed and one-per-field ranges should decode the same way."""
+        _, documents = _decode_index(index())
+        occurrences = documents[0]['occurrences']
+        
+        assert occurrences[0]['range'] == [0, 4, 7]
+        assert occurrences[1]['range'] == [3, 8, 11]
+    
+    def test_multibyte_varints(self):
+        """Values past 127 should span several varint bytes."""
+        doc = field(1, "big.py") + field(2, packed(1, [300, 0, 70000]) + field(2, "s"))
+        
+        _, documents = _decode_index(field(2, doc))
+        
+        assert documents[0]['occurrences'][0]['range'] == [300, 0, 70000]
+    
+    def test_empty_input(self):
+        """An empty buffer is an empty index."""
+        assert _decode_index(b"") == ({}, [])
+    
+    @pytest.mark.parametrize("data", [
+        index()[:-3],          # truncated inside a document
+        b"\x0a\x80",           # truncated length varint
+        b"\x0f",               # unsupported wire type
+        b"\x00\x01",           # field number 0
+        b"\xff" * 11,          # over-long varint
+    ])
+    def test_malformed_input_raises_value_error(self, data):
+        """Malformed input should raise ValueError, not IndexError."""
+        with pytest.raises(ValueError):
+            _decode_index(data)
+
+
+class TestSCIPIteratorFormats:
+    """Tests for picking the decoder from the index content."""
+    
+    def parse(self, data, name="index.scip"):
+        """Write data to an index file and parse it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / name
+            path.write_bytes(data)
+            iterator = SCIPIterator(path)
+            assert iterator.parse()
+            return iterator
+    
+    def test_binary_index(self):
+        """Binary indexes should decode without the protobuf package."""
+        iterator = self.parse(index())
+        
+        assert list(iterator.get_documents()) == ['src/foo.py']
+        assert iterator.get_metadata()['project_root'] == 'file:///repo'
+    
+    def test_binary_index_starting_with_brace(self):
+        """A metadata length byte equal to "{" should not look like JSON."""
+        data = index(project_root="x" * 85)
+        assert data[:2] == b"\x0a{"
+        
+        iterator = self.parse(data)
+        
+        assert list(iterator.get_documents()) == ['src/foo.py']
+    
+    def test_gzipped_binary_index(self):
+        """Gzipped indexes should be sniffed after decompression."""
+        iterator = self.parse(gzip.compress(index()), name="index.scip.gz")
+        
+        assert list(iterator.get_documents()) == ['src/foo.py']
+    
+    def test_json_index(self):
+        """JSON indexes should still go to the JSON parser."""
+        data = b' \n{"metadata": {"version": 1}, "documents": [{"relative_path": "a.py"}]}'
+        
+        iterator = self.parse(data)
+        
+        assert list(iterator.get_documents()) == ['a.py']
+        assert iterator.get_metadata() == {'version': 1}
+    
+    def test_malformed_binary_falls_back(self):
+        """An undecodable binary index should parse as empty, not fail."""
+        iterator = self.parse(index()[:-3])
+        
+        assert iterator.get_documents() == {}
+
+
+class TestSCIPProvider:
+    """Tests for SCIPProvider lookups over a JSON index."""
+    
+    @pytest.fixture
+    def provider(self):
+        """Create a provider over JSON_INDEX."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "index.scip").write_text(json.dumps(JSON_INDEX))
+            provider = SCIPProvider(root).initialize()
+            assert provider.is_available()
+            yield provider
+            provider.shutdown()
+    
+    def starts(self, provider, locations):
+        """(relative file, line, character) of each location's start."""
+        return [
+            (str(Path(loc.file).relative_to(provider.repo_root)), loc.range.start.line, loc.range.start.character)
+            for loc in locations
+        ]
+    
+    def definition_ids(self, provider, path, line, character):
+        """Symbol ids defined at a position."""
+        symbols = provider.get_definitions(provider.repo_root / path, Position(line, character))
+        return [symbol.id for symbol in symbols]
+    
+    def test_definition_at_occurrence(self, provider):
+        """The occurrence at or near the position should resolve to its symbol."""
+        [symbol] = provider.get_definitions(provider.repo_root / "pkg/a.py", Position(0, 6))
+        
+        assert symbol.id == "pkg/foo()."
+        assert symbol.name == "foo()."
+        assert symbol.kind == "function"
+        assert symbol.docstring == "Does foo."
+        assert symbol.location.file == str(provider.repo_root / "pkg/a.py")
+    
+    def test_definition_uses_display_name_and_signature(self, provider):
+        """Display names and signatures should come from the symbol data."""
+        assert provider.get_definitions(provider.repo_root / "pkg/a.py", Position(3, 4))[0].name == "bar"
+        
+        [widget] = provider.get_definitions(provider.repo_root / "pkg/b.py", Position(0, 40))
+        assert widget.kind == "class"
+        assert widget.signature == "class Widget"
+    
+    def test_definition_skips_symbol_without_definition(self, provider):
+        """An occurrence of an undefined symbol should not be returned."""
+        # ext/missing(). is the nearest occurrence but has no symbol entry
+        assert self.definition_ids(provider, "pkg/a.py", 1, 11) == ["pkg/bar()."]
+    
+    def test_definition_misses(self, provider):
+        """Positions away from any occurrence, or unknown files, find nothing."""
+        assert self.definition_ids(provider, "pkg/a.py", 9, 0) == []
+        assert self.definition_ids(provider, "pkg/b.py", 0, 70) == []
+        assert self.definition_ids(provider, "pkg/c.py", 0, 0) == []
+    
+    def test_references_across_documents(self, provider):
+        """Every occurrence of a symbol should be a reference, in index order."""
+        references = provider.get_references("pkg/foo().")
+        
+        assert self.starts(provider, references) == [
+            ("pkg/a.py", 0, 4), ("pkg/a.py", 5, 0), ("pkg/b.py", 2, 8)
+        ]
+        assert self.starts(provider, provider.get_references("pkg/bar().")) == [
+            ("pkg/a.py", 3, 4), ("pkg/a.py", 1, 4)
+        ]
+        # Locations are built once and reused
+        assert provider.get_references("pkg/foo().") is references
+    
+    def test_references_of_undefined_and_unknown_symbols(self, provider):
+        """Undefined symbols keep their occurrences; unknown ones have none."""
+        assert self.starts(provider, provider.get_references("ext/missing().")) == [("pkg/a.py", 1, 10)]
+        assert provider.get_references("pkg/nope().") == []
+    
+    def test_call_hierarchy(self, provider):
+        """Reference relationships should produce incoming and outgoing calls."""
+        hierarchy = provider.get_call_hierarchy("pkg/foo().")
+        
+        incoming = [(c.caller.id, c.callee.id) for c in hierarchy["incoming"]]
+        outgoing = [(c.caller.id, c.callee.id) for c in hierarchy["outgoing"]]
+        assert incoming == [("pkg/bar().", "pkg/foo().")] * 2
+        assert outgoing == [("pkg/foo().", "pkg/bar().")] * 3
+        assert self.starts(provider, [c.location for c in hierarchy["incoming"]]) == [
+            ("pkg/a.py", 3, 4), ("pkg/a.py", 1, 4)
+        ]
+        
+        assert len(provider.get_call_hierarchy("pkg/foo().", direction="incoming")["outgoing"]) == 0
+    
+    def test_call_hierarchy_without_relationships(self, provider):
+        """Symbols without relationships or definitions have no calls."""
+        empty = {"incoming": [], "outgoing": []}
+        
+        assert provider.get_call_hierarchy("pkg/bar().") == empty
+        assert provider.get_call_hierarchy("ext/missing().") == empty
+    
+    def test_statistics(self, provider):
+        """Statistics should count defined symbols, documents and referenced symbols."""
+        assert provider.get_statistics() == {
+            "symbols": 3,
+            "documents": 2,
+            "cached_symbols": 3,
+            "cached_locations": 4,
+        }
+        assert provider.supported_languages == ["python"]
+    
+    def test_statistics_without_index(self):
+        """A provider without an index reports empty statistics."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            provider = SCIPProvider(Path(tmpdir)).initialize()
+            
+            assert not provider.is_available()
+            assert provider.get_statistics() == {"symbols": 0, "documents": 0}
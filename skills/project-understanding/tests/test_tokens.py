@@ -139,7 +139,18 @@ class TestTruncateToBudget:
         result = truncate_to_budget(text, budget, preserve_priority=True)
         # High priority section should be more likely present
         assert "High Priority" in result
-    
+
+    def test_kept_sections_restore_original_order(self):
+        """Kept sections should come back in document order, even with repeated headers."""
+        text = (
+            "### Notes\n\nfirst\n\n"
+            "## Main\n\nbody\n\n"
+            "### Notes\n\nsecond\n\n"
+            "#### Filler\n\n" + "word " * 200
+        )
+        result = truncate_to_budget(text, 60, preserve_priority=True)
+        assert result.index("first") < result.index("body") < result.index("second")
+
     def test_empty_text(self):
         """Truncating empty text returns empty."""
         assert truncate_to_budget("", 100) == ""
@@ -0,0 +1,62 @@
+"""
+Unit tests for the watcher module.
+
+Tests cover:
+- Debounced updates on the consumer thread
+- Recovery from failed updates
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from scripts.lib.watcher import WatchMode
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll condition until it holds or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestWatchConsumer:
+    """Tests for the watch-mode consumer thread."""
+    
+    def test_failed_update_is_retried_and_consumer_survives(self):
+        """A raising update should be retried, and later events still indexed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            (repo / ".pui").mkdir()
+            watcher = WatchMode(repo, repo, debounce_seconds=0.02)
+            
+            calls = []
+            
+            def update(changes):
+                calls.append(set(changes))
+                if len(calls) == 1:
+                    raise RuntimeError("indexer failed")
+            
+            watcher._update_callback = update
+            watcher._running = True
+            consumer = threading.Thread(target=watcher._consume, daemon=True)
+            consumer.start()
+            try:
+                watcher._on_file_change('modified', str(repo / "a.py"))
+                assert wait_for(lambda: len(calls) >= 2)
+                assert calls[:2] == [{"a.py"}, {"a.py"}]
+                
+                watcher._on_file_change('modified', str(repo / "b.py"))
+                assert wait_for(lambda: {"b.py"} in calls)
+                
+                assert consumer.is_alive()
+                assert watcher.stats.updates_failed == 1
+                assert watcher.stats.updates_completed == 2
+            finally:
+                watcher._running = False
+                watcher._event_q.put(None)
+                consumer.join(timeout=5)
@@ -0,0 +1,72 @@
+"""
+Unit tests for the workspace module.
+
+Tests cover:
+- Cross-repository symbol search
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+
+from scripts.lib.db import Database
+from scripts.lib.workspace import WorkspaceManager
+
+
+def index_repo(root, symbol):
+    """Create a repository index defining one function."""
+    db = Database(root / ".pui" / "index.sqlite")
+    db.connect()
+    file_id = db.add_file(f"{root.name}.py", 1, 1, "hash")
+    db.add_symbol(file_id, symbol, "function", 1)
+    db.conn.commit()
+    db.close()
+
+
+class TestFindSymbolAcrossRepos:
+    """Tests for searching symbols in every workspace repository."""
+    
+    @pytest.fixture
+    def repos(self):
+        """Three repositories; the middle one has a corrupt index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            roots = []
+            for name in ("alpha", "broken", "gamma"):
+                root = Path(tmpdir) / name
+                (root / ".pui").mkdir(parents=True)
+                roots.append(root)
+            index_repo(roots[0], "handler")
+            (roots[1] / ".pui" / "index.sqlite").write_bytes(b"not a database" * 100)
+            index_repo(roots[2], "handler")
+            yield roots
+    
+    def test_broken_repo_does_not_hide_others(self, repos):
+        """A repository that cannot be attached should only drop its own results."""
+        manager = WorkspaceManager()
+        manager.create_workspace("ws", repos)
+        
+        try:
+            results = manager.find_symbol_across_repos("handler")
+        finally:
+            manager.close()
+        
+        assert [(r['repo'], r['name'], r['file']) for r in results] == [
+            ("alpha", "handler", "alpha.py"),
+            ("gamma", "handler", "gamma.py"),
+        ]
+    
+    def test_repaired_repo_is_attached_on_next_search(self, repos):
+        """A repository that failed to attach should be retried."""
+        manager = WorkspaceManager()
+        manager.create_workspace("ws", repos)
+        
+        try:
+            manager.find_symbol_across_repos("handler")
+            (repos[1] / ".pui" / "index.sqlite").unlink()
+            index_repo(repos[1], "handler")
+            
+            results = manager.find_symbol_across_repos("handler")
+        finally:
+            manager.close()
+        
+        assert [r['repo'] for r in results] == ["alpha", "broken", "gamma"]